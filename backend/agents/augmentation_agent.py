@@ -1,67 +1,90 @@
-import json
-import google.generativeai as genai
-from dotenv import load_dotenv, find_dotenv
-from backend.logger import send_log
-
-# IMPORTANT: Configure GEMINI KEY before running
-genai.configure(api_key="your-api-key")
-load_dotenv(find_dotenv(), override=False)
-model = genai.GenerativeModel("gemini-2.5-flash")
-
-
-def augmentation_agent_node(state):
-    send_log("augmentation", "Augmentation Planner (Gemini) Running...")
-
-    stats = state["dataset_stats"]
-
-    prompt = f"""
-    You are an expert deep learning engineer specializing in data augmentation.
-
-    Here is the dataset analysis:
-    {json.dumps(stats, indent=2)}
-
-    Based on this, create an augmentation plan.
-
-    Follow these RULES:
-    - If dataset_size < 100: rotation = 10–20 degrees.
-    - If imbalance_ratio > 3: flip = true.
-    - If avg_blur > 10: reduce rotation (≤10) + color_jitter = "low".
-    - If avg_noise > 0.15: color_jitter = "none".
-    - Always include keys: rotation, flip, color_jitter.
-
-    Output ONLY valid JSON in this EXACT format:
-
-    {{
-      "rotation": <int>,
-      "flip": <true/false>,
-      "color_jitter": "none" | "low" | "medium"
-    }}
-    """
-
-    # Gemini call
-    response = model.generate_content(prompt)
-
-    raw_text = response.text.strip()
-    send_log("augmentation", "Raw Gemini Output:")
-    send_log("augmentation", raw_text)
-
-    # Parse JSON safely
-    try:
-        aug_plan = json.loads(raw_text)
-    except:
-        send_log("augmentation", "JSON parse failed! Using fallback defaults.", level="warning")
-        aug_plan = {
-            "rotation": 10,
-            "flip": True,
-            "color_jitter": "low"
-        }
-
-    # Save to state
-    state["aug_plan"] = aug_plan
-
-    send_log("augmentation", "Final Augmentation Plan:")
-    send_log("augmentation", str(aug_plan))
-    send_log("augmentation", "Finished.")
-
-    return state
-
+import json
+from backend import metrics
+from backend.logger import send_log
+from backend.tools.gemini_client import generate_text
+from backend.tools.llm_cache import cache_key, get_cached, put_cached, CACHE_BYPASS
+from backend.tools.planner_rules import plan_augmentation, PLANNER_BACKEND
+
+MODEL_NAME = "gemini-2.5-flash"
+
+# Bump whenever PROMPT_TEMPLATE changes so cached plans are invalidated
+PROMPT_VERSION = "augmentation-v1"
+
+PROMPT_TEMPLATE = """
+    You are an expert deep learning engineer specializing in data augmentation.
+
+    Here is the dataset analysis:
+    {stats}
+
+    Based on this, create an augmentation plan.
+
+    Follow these RULES:
+    - If dataset_size < 100: rotation = 10–20 degrees.
+    - If imbalance_ratio > 3: flip = true.
+    - If avg_blur > 10: reduce rotation (≤10) + color_jitter = "low".
+    - If avg_noise > 0.15: color_jitter = "none".
+    - Always include keys: rotation, flip, color_jitter.
+
+    Output ONLY valid JSON in this EXACT format:
+
+    {{
+      "rotation": <int>,
+      "flip": <true/false>,
+      "color_jitter": "none" | "low" | "medium"
+    }}
+    """
+
+
+def augmentation_agent_node(state):
+    send_log("augmentation", "Augmentation Planner (Gemini) Running...")
+
+    stats = state["dataset_stats"]
+
+    # Identical stats + prompt + model => reuse the previous plan
+    key = cache_key(PROMPT_VERSION, MODEL_NAME, stats)
+    bypass = CACHE_BYPASS or state.get("llm_cache_bypass", False)
+    cached_plan = None if bypass else get_cached(key)
+
+    if cached_plan is not None:
+        send_log("augmentation", "Using cached augmentation plan.")
+        return finish_plan(state, cached_plan, "cache")
+
+    if PLANNER_BACKEND == "rules":
+        send_log("augmentation", "Using local rule engine.")
+        return finish_plan(state, plan_augmentation(stats), "rules")
+
+    prompt = PROMPT_TEMPLATE.format(stats=json.dumps(stats, indent=2))
+
+    # Gemini call (falls back to the local rules on timeout / network errors)
+    try:
+        raw_text = generate_text(MODEL_NAME, prompt)
+    except Exception as e:
+        send_log("augmentation", f"Gemini unavailable ({e}); using local rule engine.", level="warning")
+        return finish_plan(state, plan_augmentation(stats), "fallback")
+
+    send_log("augmentation", "Raw Gemini Output:")
+    send_log("augmentation", raw_text)
+
+    # Parse JSON safely
+    source = "gemini"
+    try:
+        aug_plan = json.loads(raw_text)
+    except:
+        send_log("augmentation", "JSON parse failed! Using local rule engine.", level="warning")
+        aug_plan = plan_augmentation(stats)
+        source = "fallback"
+    else:
+        put_cached(key, aug_plan, PROMPT_VERSION, MODEL_NAME)
+
+    return finish_plan(state, aug_plan, source)
+
+
+def finish_plan(state, aug_plan, source):
+    metrics.inc("automed_planner_requests_total", agent="augmentation", source=source)
+    send_log("augmentation", "Final Augmentation Plan:")
+    send_log("augmentation", str(aug_plan))
+    send_log("augmentation", "Finished.")
+
+    # Only this node's key: it runs in parallel with the model selector
+    return {"aug_plan": aug_plan}
+
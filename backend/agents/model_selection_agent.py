@@ -1,69 +1,92 @@
-# ================================================
-# 6. AGENT 3 — MODEL SELECTION AGENT (GEMINI)
-# ================================================
-import json
-import google.generativeai as genai
-from dotenv import load_dotenv, find_dotenv
-from backend.logger import send_log
-
-# IMPORTANT: Configure GEMINI KEY before running
-genai.configure(api_key="your-api-key")
-load_dotenv(find_dotenv(), override=False)
-model_selector = genai.GenerativeModel("gemini-2.5-flash")
-
-
-def model_selection_agent_node(state):
-    send_log("model_selector", "Model Selection Agent Running...")
-
-    stats = state["dataset_stats"]
-    dataset_size = stats["size"]
-    imbalance = stats["imbalance_ratio"]
-    blur = stats["avg_blur"]
-    noise = stats["avg_noise"]
-
-    prompt = f"""
-    You are an AI agent that selects the most appropriate deep learning architecture.
-
-    Available models:
-    - ResNet18 (strong on small datasets, quick to train)
-    - EfficientNet-B0 (best generalization, stable on imbalance/noise)
-    - MobileNetV2 (fast, lightweight, robust to low-quality images)
-
-    Dataset stats:
-    {json.dumps(stats, indent=2)}
-
-    Selection Rules:
-    - If dataset_size < 150 → ResNet18
-    - If imbalance_ratio > 3 → EfficientNet-B0
-    - If avg_noise > 0.20 → MobileNetV2
-    - If avg_blur > 12 → EfficientNet-B0
-    - If no special conditions → EfficientNet-B0
-
-    Output ONLY JSON:
-    {{
-        "selected_model": "resnet" | "efficientnet" | "mobilenet",
-        "reason": "<one sentence reason>"
-    }}
-    """
-
-    response = model_selector.generate_content(prompt).text.strip()
-
-    send_log("model_selector", "Raw Gemini Output:")
-    send_log("model_selector", response)
-
-    try:
-        selection = json.loads(response)
-    except:
-        send_log("model_selector", "JSON parsing failed, using default = ResNet18", level="warning")
-        selection = {
-            "selected_model": "resnet",
-            "reason": "Fallback selection"
-        }
-
-    state["selected_model"] = selection
-
-    send_log("model_selector", f"Selected Model: {selection}")
-    send_log("model_selector", "Finished.")
-
-    return state
-
+# ================================================
+# 6. AGENT 3 — MODEL SELECTION AGENT (GEMINI)
+# ================================================
+import json
+from backend import metrics
+from backend.logger import send_log
+from backend.tools.gemini_client import generate_text
+from backend.tools.llm_cache import cache_key, get_cached, put_cached, CACHE_BYPASS
+from backend.tools.planner_rules import select_model, PLANNER_BACKEND
+
+MODEL_NAME = "gemini-2.5-flash"
+
+# Bump whenever PROMPT_TEMPLATE changes so cached selections are invalidated
+PROMPT_VERSION = "model-selection-v1"
+
+PROMPT_TEMPLATE = """
+    You are an AI agent that selects the most appropriate deep learning architecture.
+
+    Available models:
+    - ResNet18 (strong on small datasets, quick to train)
+    - EfficientNet-B0 (best generalization, stable on imbalance/noise)
+    - MobileNetV2 (fast, lightweight, robust to low-quality images)
+
+    Dataset stats:
+    {stats}
+
+    Selection Rules:
+    - If dataset_size < 150 → ResNet18
+    - If imbalance_ratio > 3 → EfficientNet-B0
+    - If avg_noise > 0.20 → MobileNetV2
+    - If avg_blur > 12 → EfficientNet-B0
+    - If no special conditions → EfficientNet-B0
+
+    Output ONLY JSON:
+    {{
+        "selected_model": "resnet" | "efficientnet" | "mobilenet",
+        "reason": "<one sentence reason>"
+    }}
+    """
+
+
+def model_selection_agent_node(state):
+    send_log("model_selector", "Model Selection Agent Running...")
+
+    stats = state["dataset_stats"]
+
+    # Identical stats + prompt + model => reuse the previous selection
+    key = cache_key(PROMPT_VERSION, MODEL_NAME, stats)
+    bypass = CACHE_BYPASS or state.get("llm_cache_bypass", False)
+    cached_selection = None if bypass else get_cached(key)
+
+    if cached_selection is not None:
+        send_log("model_selector", "Using cached model selection.")
+        return finish_selection(state, cached_selection, "cache")
+
+    if PLANNER_BACKEND == "rules":
+        send_log("model_selector", "Using local rule engine.")
+        return finish_selection(state, select_model(stats), "rules")
+
+    prompt = PROMPT_TEMPLATE.format(stats=json.dumps(stats, indent=2))
+
+    # Gemini call (falls back to the local rules on timeout / network errors)
+    try:
+        response = generate_text(MODEL_NAME, prompt)
+    except Exception as e:
+        send_log("model_selector", f"Gemini unavailable ({e}); using local rule engine.", level="warning")
+        return finish_selection(state, select_model(stats), "fallback")
+
+    send_log("model_selector", "Raw Gemini Output:")
+    send_log("model_selector", response)
+
+    source = "gemini"
+    try:
+        selection = json.loads(response)
+    except:
+        send_log("model_selector", "JSON parsing failed, using local rule engine.", level="warning")
+        selection = select_model(stats)
+        source = "fallback"
+    else:
+        put_cached(key, selection, PROMPT_VERSION, MODEL_NAME)
+
+    return finish_selection(state, selection, source)
+
+
+def finish_selection(state, selection, source):
+    metrics.inc("automed_planner_requests_total", agent="model_selector", source=source)
+    send_log("model_selector", f"Selected Model: {selection}")
+    send_log("model_selector", "Finished.")
+
+    # Only this node's key: it runs in parallel with the augmentation planner
+    return {"selected_model": selection}
+
@@ -1,123 +1,332 @@
-# ================================================
-# 7. AGENT 4 — MODEL TRAINER (DYNAMIC)
-# ================================================
-import torch
-import torch.nn as nn
-import torch.optim as optim
-from torchvision import models
-from torchvision.datasets import ImageFolder
-from torch.utils.data import DataLoader
-import torchvision.transforms as T
-from sklearn.metrics import f1_score
-import os
-from backend.logger import send_log
-
-
-def build_model(selected_model, num_classes):
-    if selected_model == "resnet":
-        model = models.resnet18(pretrained=True)
-        model.fc = nn.Linear(512, num_classes)
-
-    elif selected_model == "efficientnet":
-        model = models.efficientnet_b0(pretrained=True)
-        model.classifier[1] = nn.Linear(model.classifier[1].in_features, num_classes)
-
-    elif selected_model == "mobilenet":
-        model = models.mobilenet_v2(pretrained=True)
-        model.classifier[1] = nn.Linear(model.classifier[1].in_features, num_classes)
-
-    else:
-        raise ValueError("Invalid model selected")
-
-    return model
-
-
-def model_trainer_node(state):
-    send_log("trainer", "Model Trainer Running...")
-
-    dataset_path = state["dataset_path"]
-    aug = state["aug_plan"]
-    selected = state["selected_model"]["selected_model"]
-    num_classes = len(state["dataset_stats"]["class_dist"])
-
-    send_log("trainer", f"Selected Model: {selected}")
-    send_log("trainer", f"Number of Classes: {num_classes}")
-
-    # Build augmentation
-    transform = T.Compose([
-        T.Resize((224, 224)),
-        T.RandomRotation(aug["rotation"]),
-        T.RandomHorizontalFlip() if aug["flip"] else T.Lambda(lambda x: x),
-    ])
-
-    if aug["color_jitter"] == "low":
-        transform.transforms.append(T.ColorJitter(brightness=0.1, contrast=0.1))
-    elif aug["color_jitter"] == "medium":
-        transform.transforms.append(T.ColorJitter(brightness=0.2, contrast=0.2))
-
-    transform.transforms.append(T.ToTensor())
-
-    # Load dataset
-    train_dataset = ImageFolder(f"{dataset_path}/train", transform)
-    train_loader = DataLoader(train_dataset, batch_size=16, shuffle=True)
-
-    # Build model
-    model = build_model(selected, num_classes)
-    device = "cuda" if torch.cuda.is_available() else "cpu"
-    model = model.to(device)
-
-    send_log("trainer", f"Training on: {device}")
-
-    # Optimizer
-    criterion = nn.CrossEntropyLoss()
-    optimizer = optim.Adam(model.parameters(), lr=1e-4)
-
-    all_preds, all_labels = [], []
-
-    # QUICK training for demo
-    for epoch in range(2):
-        send_log("trainer", f"Epoch {epoch + 1}/2")
-
-        for imgs, labels in train_loader:
-            imgs = imgs.to(device)
-            labels = labels.to(device)
-
-            optimizer.zero_grad()
-            outputs = model(imgs)
-            loss = criterion(outputs, labels)
-            loss.backward()
-            optimizer.step()
-
-            preds = torch.argmax(outputs, dim=1)
-            all_preds.extend(preds.cpu().numpy())
-            all_labels.extend(labels.cpu().numpy())
-
-    # Metrics
-    accuracy = sum(int(p == l) for p, l in zip(all_preds, all_labels)) / len(all_preds)
-    f1 = f1_score(all_labels, all_preds, average="weighted")
-
-    # Save model
-    os.makedirs("models", exist_ok=True)
-    model_path = f"models/{selected}_model.pt"
-    torch.save(model.state_dict(), model_path)
-    
-    # Save class names
-    import json
-    classes_path = f"models/{selected}_classes.json"
-    with open(classes_path, "w") as f:
-        json.dump(train_dataset.classes, f)
-
-    results = {
-        "accuracy": float(accuracy),
-        "f1_score": float(f1),
-        "model": selected,
-        "model_path": model_path
-    }
-
-    state["model_results"] = results
-
-    send_log("trainer", "Training Complete. Results:")
-    send_log("trainer", str(results))
-    send_log("trainer", "Finished.")
-
-    return state
+# ================================================
+# 7. AGENT 4 — MODEL TRAINER (DYNAMIC)
+# ================================================
+import torch
+import torch.nn as nn
+import torch.optim as optim
+from torch.utils.data import DataLoader, Subset
+from sklearn.metrics import f1_score
+import os
+import tempfile
+from backend import cancellation
+from backend.logger import send_log
+from backend.tools.balanced_sampling import (
+    BalancedEpochSampler,
+    CLASS_WEIGHTED_LOSS,
+    balancing_enabled,
+    class_weights,
+    per_class_metrics,
+    subset_targets,
+)
+from backend.tools.calibration import CALIBRATION_ENABLED, calibrate, test_split_logits
+from backend.tools.image_datasets import is_streaming, open_split
+from backend.tools.incremental import load_previous_model, replay_sample, sample_file_index, split_new_samples
+from backend.services.model_store import get_model_store
+from backend.tools.training import (
+    BATCH_SIZE,
+    LEARNING_RATE,
+    NUM_EPOCHS,
+    build_model,
+    build_transform,
+    load_trainer_checkpoint,
+    save_trainer_checkpoint,
+    train_one_epoch,
+    trainer_checkpoint_path,
+)
+
+# Training processes per run (>1 = DistributedDataParallel over gloo, CPU only)
+DEFAULT_TRAIN_PROCESSES = int(os.getenv("AUTOMED_TRAIN_PROCESSES", "1"))
+
+
+def model_trainer_node(state):
+    send_log("trainer", "Model Trainer Running...")
+
+    dataset_path = state["dataset_path"]
+    aug = state["aug_plan"]
+    selected = state["selected_model"]["selected_model"]
+    num_classes = len(state["dataset_stats"]["class_dist"])
+
+    send_log("trainer", f"Selected Model: {selected}")
+    send_log("trainer", f"Number of Classes: {num_classes}")
+
+    # Build augmentation
+    transform = build_transform(aug)
+
+    # Load dataset (folder or archive)
+    train_dataset = open_split(dataset_path, "train", transform)
+
+    # Sweep mode: successive halving over architectures x lr x batch size
+    # Incremental mode: fine-tune the previous model on new images + replay
+    if state.get("sweep"):
+        mode = "sweep"
+    elif state.get("incremental"):
+        mode = "incremental"
+    else:
+        mode = "full"
+    train_indices = None  # None = whole training set
+    init_weights = None
+    num_new = len(train_dataset)
+    # Signatures of everything the loader trains on, saved with the model
+    file_index = sample_file_index(train_dataset.samples, dataset_path, state.get("file_index", {}))
+
+    if mode == "incremental":
+        previous = load_previous_model(selected, train_dataset.classes)
+        if previous is None:
+            send_log("trainer", "No compatible previous model found; falling back to full training.", level="warning")
+            mode = "full"
+        else:
+            new_indices, seen_indices = split_new_samples(
+                train_dataset.samples, dataset_path, file_index, previous["files"]
+            )
+            num_new = len(new_indices)
+
+            if not new_indices:
+                send_log("trainer", "No new images since the last run; keeping the existing model.")
+                state["model_results"] = {
+                    **previous["results"],
+                    "model_path": previous["path"],
+                    "version": previous["version"],
+                    "mode": mode,
+                    "new_images": 0
+                }
+                send_log("trainer", "Finished.")
+                return state
+
+            train_indices = new_indices + replay_sample(seen_indices, num_new)
+            init_weights = previous["state_dict"]
+            send_log(
+                "trainer",
+                f"Incremental update: {num_new} new images + {len(train_indices) - num_new} replayed"
+            )
+
+    checkpoint_path = trainer_checkpoint_path(state["run_id"]) if state.get("run_id") else None
+
+    # Imbalanced datasets: class-balanced sampling and/or class-weighted loss
+    imbalance = state["dataset_stats"].get("imbalance_ratio", 1)
+    balanced = balancing_enabled(state["dataset_stats"], state.get("balanced_sampling"))
+    weighted_loss = state.get("class_weighted_loss")
+    if weighted_loss is None:
+        weighted_loss = CLASS_WEIGHTED_LOSS
+    if balanced and is_streaming(train_dataset):
+        send_log("trainer", "Class-balanced sampling needs random access; disabled for compressed tar archives.", level="warning")
+        balanced = False
+    if balanced:
+        send_log("trainer", f"Class-balanced sampling enabled (imbalance ratio {imbalance:.2f})")
+    if weighted_loss:
+        send_log("trainer", "Class-weighted loss enabled")
+
+    # Distributed training only pays off on CPU; GPUs keep the single-process path
+    world_size = state.get("train_processes") or DEFAULT_TRAIN_PROCESSES
+    if world_size > 1 and torch.cuda.is_available():
+        send_log("trainer", "CUDA available: ignoring multi-process CPU training.", level="warning")
+        world_size = 1
+
+    sweep_leaderboard = None
+    if mode == "sweep":
+        from backend.tools.sweep import run_sweep
+
+        if world_size > 1:
+            # Only reachable through AUTOMED_TRAIN_PROCESSES; the API rejects the combination
+            send_log("trainer", "Sweep trains candidates in parallel processes; ignoring multi-process training.", level="warning")
+        sweep = run_sweep(
+            dataset_path, aug, num_classes, balanced=balanced, weighted_loss=weighted_loss, run_id=state.get("run_id")
+        )
+        selected = sweep["winner"]["arch"]
+        sweep_leaderboard = sweep["leaderboard"]
+        send_log("trainer", f"Sweep winner: {sweep['winner']['id']} (promoted to models/)")
+
+        model = build_model(selected, num_classes, pretrained=False)
+        model.load_state_dict(sweep["state_dict"])
+        # Sweep metrics are the winner's hold-out predictions before it was finished on the full split
+        all_preds, all_labels = sweep["val_preds"], sweep["val_labels"]
+    elif world_size > 1:
+        model, all_preds, all_labels = train_multi_process(
+            world_size, dataset_path, aug, selected, num_classes, train_dataset.classes,
+            mode, train_indices, init_weights, checkpoint_path,
+            balanced=balanced, weighted_loss=weighted_loss, run_id=state.get("run_id")
+        )
+    else:
+        model, all_preds, all_labels = train_single_process(
+            train_dataset, selected, num_classes, mode, train_indices, init_weights, checkpoint_path,
+            balanced=balanced, weighted_loss=weighted_loss, run_id=state.get("run_id")
+        )
+
+    # Metrics
+    accuracy = sum(int(p == l) for p, l in zip(all_preds, all_labels)) / len(all_preds)
+    f1 = f1_score(all_labels, all_preds, average="weighted")
+
+    results = {
+        "accuracy": float(accuracy),
+        "f1_score": float(f1),
+        "model": selected,
+        "mode": mode,
+        "new_images": num_new,
+        "train_processes": world_size,
+        "balanced_sampling": balanced,
+        "class_weighted_loss": weighted_loss
+    }
+    if sweep_leaderboard is not None:
+        results["sweep"] = sweep_leaderboard
+
+    # Held-out evaluation on the test split: per-class metrics (un-augmented, final
+    # weights) and temperature scaling, stored with the model for calibrated inference
+    test_logits = test_split_logits(model, dataset_path, train_dataset.classes, aug, tta=CALIBRATION_ENABLED)
+    if test_logits is None:
+        send_log("trainer", "No matching test split; skipping per-class metrics and calibration.", level="warning")
+    else:
+        plain, averaged, labels = test_logits
+        results["per_class"] = per_class_metrics(labels.tolist(), plain.argmax(dim=1).tolist(), train_dataset.classes)
+        for name, m in results["per_class"].items():
+            send_log("trainer", f"Test {name}: recall {m['recall']:.2f}, precision {m['precision']:.2f} ({m['support']} images)")
+
+        if CALIBRATION_ENABLED:
+            calibration = calibrate(plain, averaged, labels, aug)
+            results["calibration"] = calibration
+            send_log(
+                "trainer",
+                f"Calibrated on {calibration['samples']} test images: "
+                f"T={calibration['temperature']:.2f} (TTA T={calibration['tta_temperature']:.2f}), "
+                f"NLL {calibration['nll']:.3f} -> {calibration['calibrated_nll']:.3f}"
+            )
+
+    # Publish a new model version (the file index lets the next incremental run spot new images)
+    cancellation.check(state.get("run_id"))
+    store = get_model_store()
+    record = store.save(
+        selected,
+        model.cpu().state_dict(),
+        train_dataset.classes,
+        metrics=results,
+        run_id=state.get("run_id"),
+        file_index=file_index
+    )
+    results["model_path"] = record["path"]
+    results["version"] = record["version"]
+
+    # Only now that the model is published is the epoch checkpoint no longer needed
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    removed = store.gc()
+    if removed:
+        send_log("trainer", f"Removed {removed} old model version(s)")
+
+    state["model_results"] = results
+
+    send_log("trainer", "Training Complete. Results:")
+    send_log("trainer", str(results))
+    send_log("trainer", "Finished.")
+
+    return state
+
+
+def train_single_process(
+    train_dataset, selected, num_classes, mode, train_indices, init_weights, checkpoint_path,
+    balanced=False, weighted_loss=False, run_id=None
+):
+    """Train in this process; returns (model, all_preds, all_labels)."""
+    model = build_model(selected, num_classes, pretrained=init_weights is None)
+    if init_weights is not None:
+        model.load_state_dict(init_weights)
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = model.to(device)
+
+    send_log("trainer", f"Training on: {device}")
+
+    # Optimizer
+    optimizer = optim.Adam(model.parameters(), lr=LEARNING_RATE)
+
+    all_preds, all_labels = [], []
+    start_epoch = 0
+
+    # Resume from the last completed epoch of this run, if any
+    checkpoint = load_trainer_checkpoint(checkpoint_path, selected, train_dataset.classes, mode)
+    if checkpoint is not None:
+        model.load_state_dict(checkpoint["model"])
+        optimizer.load_state_dict(checkpoint["optimizer"])
+        all_preds, all_labels = checkpoint["all_preds"], checkpoint["all_labels"]
+        train_indices = checkpoint["train_indices"]  # keep the same replay sample
+        start_epoch = checkpoint["epoch"] + 1
+        send_log("trainer", f"Resuming from checkpoint after epoch {start_epoch}/{NUM_EPOCHS}")
+
+    targets = subset_targets(train_dataset, train_indices)
+
+    sampler = None
+    if is_streaming(train_dataset):
+        # Compressed tar: the stream shuffles itself (and cannot be sampled)
+        train_subset = train_dataset.subset(train_indices)
+        train_loader = DataLoader(train_subset, batch_size=BATCH_SIZE)
+    else:
+        train_subset = Subset(train_dataset, train_indices) if train_indices is not None else train_dataset
+        sampler = BalancedEpochSampler(targets, num_classes) if balanced else None
+        train_loader = DataLoader(train_subset, batch_size=BATCH_SIZE, shuffle=sampler is None, sampler=sampler)
+
+    weight = class_weights(targets, num_classes).to(device) if weighted_loss else None
+    criterion = nn.CrossEntropyLoss(weight=weight)
+
+    # QUICK training for demo
+    for epoch in range(start_epoch, NUM_EPOCHS):
+        cancellation.check(run_id)
+        send_log("trainer", f"Epoch {epoch + 1}/{NUM_EPOCHS}")
+        if sampler is not None:
+            sampler.set_epoch(epoch)
+        elif is_streaming(train_subset):
+            train_subset.set_epoch(epoch)
+
+        preds, labels = train_one_epoch(model, train_loader, criterion, optimizer, device)
+        all_preds.extend(preds)
+        all_labels.extend(labels)
+
+        if checkpoint_path:
+            save_trainer_checkpoint(checkpoint_path, {
+                "epoch": epoch,
+                "selected": selected,
+                "classes": train_dataset.classes,
+                "mode": mode,
+                "train_indices": train_indices,
+                "model": model.state_dict(),
+                "optimizer": optimizer.state_dict(),
+                "all_preds": all_preds,
+                "all_labels": all_labels
+            })
+
+    return model, all_preds, all_labels
+
+
+def train_multi_process(
+    world_size, dataset_path, aug, selected, num_classes, classes,
+    mode, train_indices, init_weights, checkpoint_path,
+    balanced=False, weighted_loss=False, run_id=None
+):
+    """Train with DDP over `world_size` local processes; returns (model, all_preds, all_labels)."""
+    from backend.tools.distributed_training import train_distributed
+
+    send_log("trainer", f"Training on: cpu ({world_size} processes, gloo)")
+
+    # A resumed run keeps the replay sample it started with
+    checkpoint = load_trainer_checkpoint(checkpoint_path, selected, classes, mode)
+    if checkpoint is not None:
+        train_indices = checkpoint["train_indices"]
+
+    with tempfile.TemporaryDirectory(prefix="automed_ddp_") as tmp_dir:
+        init_weights_path = None
+        if init_weights is not None:
+            init_weights_path = os.path.join(tmp_dir, "init.pt")
+            torch.save(init_weights, init_weights_path)
+
+        result_path = os.path.join(tmp_dir, "result.pt")
+        result = train_distributed(
+            dataset_path, aug, selected, num_classes, classes, result_path, world_size,
+            mode=mode,
+            train_indices=train_indices,
+            init_weights_path=init_weights_path,
+            checkpoint_path=checkpoint_path,
+            balanced=balanced,
+            weighted_loss=weighted_loss,
+            run_id=run_id
+        )
+
+        model = build_model(selected, num_classes, pretrained=False)
+        model.load_state_dict(torch.load(result_path, map_location="cpu"))
+
+    return model, result["all_preds"], result["all_labels"]
@@ -1,351 +1,686 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException, Form
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
-from typing import Optional, Dict, Any, List
-import asyncio
-import json
-import os
-from datetime import datetime
-import uuid
-
-app = FastAPI(title="AutoMed AI API")
-
-# CORS middleware for frontend
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],  # Next.js dev server
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# In-memory storage for pipeline runs and logs
-pipeline_runs: Dict[str, Dict[str, Any]] = {}
-active_connections: List[WebSocket] = []
-
-
-# ============================================
-# Request/Response Models
-# ============================================
-
-class PipelineStartRequest(BaseModel):
-    dataset_path: str
-
-
-class PipelineStatusResponse(BaseModel):
-    run_id: str
-    status: str  # "running", "completed", "failed"
-    current_stage: Optional[str]
-    dataset_stats: Optional[Dict[str, Any]]
-    aug_plan: Optional[Dict[str, Any]]
-    selected_model: Optional[Dict[str, Any]]
-    model_results: Optional[Dict[str, Any]]
-    error: Optional[str]
-
-
-class ModelTestRequest(BaseModel):
-    model_name: str
-    image_path: str
-
-
-class ModelListResponse(BaseModel):
-    models: List[Dict[str, str]]
-
-
-class AgentLog(BaseModel):
-    timestamp: str
-    agent: str
-    message: str
-    level: str  # "info", "warning", "error"
-
-
-# ============================================
-# WebSocket Connection Manager
-# ============================================
-
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except:
-                pass
-
-
-manager = ConnectionManager()
-
-
-# ============================================
-# API Endpoints
-# ============================================
-
-@app.get("/")
-async def root():
-    return {"message": "AutoMed AI API", "version": "1.0.0"}
-
-
-@app.post("/api/pipeline/start")
-async def start_pipeline(request: PipelineStartRequest):
-    """Start the ML pipeline with the given dataset path."""
-    run_id = str(uuid.uuid4())
-    
-    # Validate dataset path
-    if not os.path.exists(request.dataset_path):
-        raise HTTPException(status_code=400, detail="Dataset path does not exist")
-    
-    # Initialize pipeline run
-    pipeline_runs[run_id] = {
-        "run_id": run_id,
-        "status": "running",
-        "current_stage": "data_inspector",
-        "dataset_path": request.dataset_path,
-        "started_at": datetime.now().isoformat(),
-        "dataset_stats": None,
-        "aug_plan": None,
-        "selected_model": None,
-        "model_results": None,
-        "error": None
-    }
-    
-    # Start pipeline in background
-    asyncio.create_task(run_pipeline(run_id, request.dataset_path))
-    
-    return {"run_id": run_id, "status": "started"}
-
-
-@app.get("/api/pipeline/status/{run_id}", response_model=PipelineStatusResponse)
-async def get_pipeline_status(run_id: str):
-    """Get the current status of a pipeline run."""
-    if run_id not in pipeline_runs:
-        raise HTTPException(status_code=404, detail="Pipeline run not found")
-    
-    return pipeline_runs[run_id]
-
-
-@app.get("/api/models", response_model=ModelListResponse)
-async def list_models():
-    """List all trained models."""
-    models_dir = "models"
-    if not os.path.exists(models_dir):
-        return {"models": []}
-    
-    models = []
-    for filename in os.listdir(models_dir):
-        if filename.endswith(".pt"):
-            model_name = filename.replace("_model.pt", "")
-            models.append({
-                "name": model_name,
-                "path": os.path.join(models_dir, filename),
-                "size": str(os.path.getsize(os.path.join(models_dir, filename)))
-            })
-    
-    return {"models": models}
-
-
-@app.get("/api/models/{model_name}/download")
-async def download_model(model_name: str):
-    """Download a trained model."""
-    model_path = f"models/{model_name}_model.pt"
-    
-    if not os.path.exists(model_path):
-        raise HTTPException(status_code=404, detail="Model not found")
-    
-    return FileResponse(
-        model_path,
-        media_type="application/octet-stream",
-        filename=f"{model_name}_model.pt"
-    )
-
-
-@app.websocket("/ws/logs")
-async def websocket_logs(websocket: WebSocket):
-    """WebSocket endpoint for real-time agent logs."""
-    await manager.connect(websocket)
-    try:
-        while True:
-            # Keep connection alive
-            await websocket.receive_text()
-    except WebSocketDisconnect:
-        manager.disconnect(websocket)
-
-
-# ============================================
-# Pipeline Execution
-# ============================================
-
-async def run_pipeline(run_id: str, dataset_path: str):
-    """Run the ML pipeline asynchronously."""
-    try:
-        from backend.pipeline_graph import test_pipeline
-        from backend.pipeline_state import PipelineState
-        
-        # Send initial log
-        await manager.broadcast({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "message": f"Pipeline started for dataset: {dataset_path}",
-            "level": "info"
-        })
-        
-        # Create initial state
-        state = PipelineState(dataset_path=dataset_path)
-        
-        # Run pipeline with logging
-        await log_and_run_agent(run_id, "data_inspector", state)
-        
-        # The pipeline runs synchronously, so we'll wrap it
-        final_state = await asyncio.to_thread(test_pipeline.invoke, state)
-        
-        # Update pipeline run with final state
-        pipeline_runs[run_id].update({
-            "status": "completed",
-            "current_stage": "completed",
-            "dataset_stats": final_state.get("dataset_stats"),
-            "aug_plan": final_state.get("aug_plan"),
-            "selected_model": final_state.get("selected_model"),
-            "model_results": final_state.get("model_results"),
-            "completed_at": datetime.now().isoformat()
-        })
-        
-        # Send completion log
-        await manager.broadcast({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "message": "Pipeline completed successfully! Model ready for testing.",
-            "level": "info"
-        })
-        
-    except Exception as e:
-        pipeline_runs[run_id].update({
-            "status": "failed",
-            "error": str(e),
-            "failed_at": datetime.now().isoformat()
-        })
-        
-        await manager.broadcast({
-            "timestamp": datetime.now().isoformat(),
-            "agent": "orchestrator",
-            "message": f"Pipeline failed: {str(e)}",
-            "level": "error"
-        })
-
-
-async def log_and_run_agent(run_id: str, agent_name: str, state: dict):
-    """Log agent execution to WebSocket."""
-    await manager.broadcast({
-        "timestamp": datetime.now().isoformat(),
-        "agent": agent_name,
-        "message": f"{agent_name.replace('_', ' ').title()} started...",
-        "level": "info"
-    })
-
-
-# ============================================
-# Model Testing & XAI
-# ============================================
-
-class ModelTestResponse(BaseModel):
-    predicted_class: int
-    confidence: float
-    explanation: str
-    heatmap_base64: str
-
-
-@app.post("/api/models/test", response_model=ModelTestResponse)
-async def test_model(
-    model_name: str = Form(...),
-    file: UploadFile = File(...)
-):
-    """Test a model on an uploaded image and generate Grad-CAM visualization."""
-    temp_file_path = None
-    try:
-        from backend.services.xai_service import generate_gradcam
-        import cv2
-        import base64
-        import numpy as np
-        import shutil
-        
-        # Create temp directory if not exists
-        temp_dir = "temp_uploads"
-        os.makedirs(temp_dir, exist_ok=True)
-        
-        # Save uploaded file
-        temp_file_path = os.path.join(temp_dir, f"{uuid.uuid4()}_{file.filename}")
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        models_dir = "models"
-        model_path = os.path.join(models_dir, f"{model_name}_model.pt")
-        if not os.path.exists(model_path):
-            raise HTTPException(status_code=404, detail="Model not found")
-            
-        # Generate Grad-CAM and prediction
-        overlay, predicted_class, confidence, explanation = await asyncio.to_thread(
-            generate_gradcam,
-            temp_file_path,
-            model_name,
-            model_path
-        )
-        
-        # Encode overlay image to base64
-        _, buffer = cv2.imencode('.jpg', overlay)
-        heatmap_base64 = base64.b64encode(buffer).decode('utf-8')
-        
-        return {
-            "predicted_class": predicted_class,
-            "confidence": float(confidence),
-            "explanation": explanation,
-            "heatmap_base64": f"data:image/jpeg;base64,{heatmap_base64}"
-        }
-        
-    except Exception as e:
-        print(f"Error testing model: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Cleanup temp file
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
-
-
-# ============================================
-# Background Log Processor
-# ============================================
-
-async def log_processor():
-    """Process logs from the queue and broadcast them via WebSocket."""
-    from backend.logger import log_queue
-    while True:
-        try:
-            # Non-blocking get from queue
-            # We use a small sleep to avoid busy waiting if queue is empty
-            if not log_queue.empty():
-                log_entry = log_queue.get_nowait()
-                await manager.broadcast(log_entry)
-            else:
-                await asyncio.sleep(0.1)
-        except Exception as e:
-            print(f"Error in log processor: {e}")
-            await asyncio.sleep(1)
-
-@app.on_event("startup")
-async def startup_event():
-    asyncio.create_task(log_processor())
-
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, UploadFile, File, HTTPException, Form, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from pydantic import BaseModel
+from typing import Optional, Dict, Any, List
+import asyncio
+import json
+import os
+from datetime import datetime
+import uuid
+
+app = FastAPI(title="AutoMed AI API")
+
+# CORS middleware for frontend
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000"],  # Next.js dev server
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# In-memory storage for pipeline runs and logs
+pipeline_runs: Dict[str, Dict[str, Any]] = {}
+active_connections: List[WebSocket] = []
+
+# PipelineService instances of runs that are still executing (for cancellation)
+active_pipelines: Dict[str, Any] = {}
+
+
+# ============================================
+# Request/Response Models
+# ============================================
+
+class PipelineStartRequest(BaseModel):
+    dataset_path: str                     # dataset folder, a zip / tar archive of one, or a folder of archive shards
+    execution_mode: Optional[str] = None  # "thread" | "process"; server default if omitted
+    llm_cache_bypass: bool = False        # ignore cached planner responses
+    incremental: bool = False             # fine-tune the previous model on new images
+    train_processes: Optional[int] = None # >1 = multi-process CPU training (DDP/gloo)
+    balanced_sampling: Optional[bool] = None  # None = automatic from the imbalance ratio
+    class_weighted_loss: Optional[bool] = None
+    sweep: bool = False                   # architecture / lr / batch size sweep
+
+    def run_options(self) -> Dict[str, Any]:
+        """Options copied into the initial PipelineState."""
+        return {
+            "llm_cache_bypass": self.llm_cache_bypass,
+            "incremental": self.incremental,
+            "train_processes": self.train_processes,
+            "balanced_sampling": self.balanced_sampling,
+            "class_weighted_loss": self.class_weighted_loss,
+            "sweep": self.sweep
+        }
+
+
+class PipelineStatusResponse(BaseModel):
+    run_id: str
+    status: str  # "running", "completed", "failed", "cancelled"
+    current_stage: Optional[str]
+    dataset_stats: Optional[Dict[str, Any]]
+    aug_plan: Optional[Dict[str, Any]]
+    selected_model: Optional[Dict[str, Any]]
+    model_results: Optional[Dict[str, Any]]
+    stage_timings: Dict[str, float] = {}
+    error: Optional[str]
+
+
+class ModelTestRequest(BaseModel):
+    model_name: str
+    image_path: str
+
+
+class ModelListResponse(BaseModel):
+    models: List[Dict[str, Any]]
+
+
+class AgentLog(BaseModel):
+    timestamp: str
+    agent: str
+    message: str
+    level: str  # "info", "warning", "error"
+
+
+# ============================================
+# WebSocket Connection Manager
+# ============================================
+
+class ConnectionManager:
+    def __init__(self):
+        self.active_connections: List[WebSocket] = []
+
+    async def connect(self, websocket: WebSocket):
+        await websocket.accept()
+        self.active_connections.append(websocket)
+
+    def disconnect(self, websocket: WebSocket):
+        self.active_connections.remove(websocket)
+
+    async def broadcast(self, message: dict):
+        for connection in self.active_connections:
+            try:
+                await connection.send_json(message)
+            except:
+                pass
+
+
+manager = ConnectionManager()
+
+
+# ============================================
+# API Endpoints
+# ============================================
+
+@app.get("/")
+async def root():
+    return {"message": "AutoMed AI API", "version": "1.0.0"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Timings and counters from the agents, workers and XAI service (Prometheus text format)."""
+    from backend import metrics
+
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+def validate_execution_mode(execution_mode: Optional[str]):
+    """400 for an unknown execution mode (None = server default)."""
+    from backend.services.pipeline_service import EXECUTION_MODES
+
+    if execution_mode is not None and execution_mode not in EXECUTION_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown execution_mode '{execution_mode}' (expected one of: {', '.join(EXECUTION_MODES)})"
+        )
+
+
+def validate_run_options(request: PipelineStartRequest):
+    """400 for option combinations the trainer cannot honour together."""
+    if request.sweep and request.incremental:
+        raise HTTPException(status_code=400, detail="sweep trains new candidates from scratch; it cannot be incremental")
+    if request.sweep and (request.train_processes or 1) > 1:
+        raise HTTPException(
+            status_code=400,
+            detail="sweep parallelises over candidates; train_processes > 1 is not supported with sweep"
+        )
+
+
+@app.post("/api/pipeline/start")
+async def start_pipeline(request: PipelineStartRequest):
+    """Start the ML pipeline with the given dataset path (folder, zip / tar archive or shard folder)."""
+    from backend.tools.archive_source import is_archive
+
+    run_id = str(uuid.uuid4())
+    
+    # Validate dataset path
+    if not os.path.exists(request.dataset_path):
+        raise HTTPException(status_code=400, detail="Dataset path does not exist")
+    if os.path.isfile(request.dataset_path) and not is_archive(request.dataset_path):
+        raise HTTPException(status_code=400, detail="Dataset file is not a zip or tar archive")
+    validate_execution_mode(request.execution_mode)
+    validate_run_options(request)
+    
+    # Initialize pipeline run
+    pipeline_runs[run_id] = {
+        "run_id": run_id,
+        "status": "running",
+        "current_stage": "data_inspector",
+        "dataset_path": request.dataset_path,
+        "started_at": datetime.now().isoformat(),
+        "dataset_stats": None,
+        "aug_plan": None,
+        "selected_model": None,
+        "model_results": None,
+        "stage_timings": {},
+        "error": None
+    }
+    
+    # Start pipeline in background
+    asyncio.create_task(run_pipeline(
+        run_id,
+        request.dataset_path,
+        request.execution_mode,
+        options=request.run_options()
+    ))
+    
+    return {"run_id": run_id, "status": "started"}
+
+
+@app.get("/api/pipeline/status/{run_id}", response_model=PipelineStatusResponse)
+async def get_pipeline_status(run_id: str):
+    """Get the current status of a pipeline run."""
+    if run_id not in pipeline_runs:
+        raise HTTPException(status_code=404, detail="Pipeline run not found")
+    
+    return pipeline_runs[run_id]
+
+
+@app.post("/api/pipeline/resume/{run_id}")
+async def resume_pipeline(run_id: str, execution_mode: Optional[str] = None):
+    """Resume a failed or cancelled run from its last checkpointed stage."""
+    from backend.pipeline_graph import checkpoints_durable
+
+    if run_id in active_pipelines:
+        raise HTTPException(status_code=409, detail="Pipeline run is already running")
+    if not checkpoints_durable():
+        raise HTTPException(
+            status_code=409,
+            detail="Runs cannot be resumed: checkpoints are not durable (install langgraph-checkpoint-sqlite)"
+        )
+    validate_execution_mode(execution_mode)
+
+    # The run record may be gone after a server restart; the checkpoint is not
+    previous = pipeline_runs.get(run_id, {})
+    pipeline_runs[run_id] = {
+        "run_id": run_id,
+        "status": "running",
+        "current_stage": previous.get("current_stage"),
+        "dataset_path": previous.get("dataset_path"),
+        "started_at": previous.get("started_at", datetime.now().isoformat()),
+        "resumed_at": datetime.now().isoformat(),
+        "dataset_stats": previous.get("dataset_stats"),
+        "aug_plan": previous.get("aug_plan"),
+        "selected_model": previous.get("selected_model"),
+        "model_results": previous.get("model_results"),
+        "stage_timings": previous.get("stage_timings", {}),
+        "error": None
+    }
+
+    asyncio.create_task(run_pipeline(run_id, None, execution_mode, resume=True))
+
+    return {"run_id": run_id, "status": "resuming"}
+
+
+@app.post("/api/pipeline/cancel/{run_id}")
+async def cancel_pipeline(run_id: str):
+    """Cancel a running pipeline."""
+    if run_id not in pipeline_runs:
+        raise HTTPException(status_code=404, detail="Pipeline run not found")
+
+    service = active_pipelines.get(run_id)
+    if service is None:
+        raise HTTPException(status_code=409, detail="Pipeline run is not running")
+
+    # Stopping a worker process may block for its grace period
+    await asyncio.to_thread(service.cancel)
+
+    return {"run_id": run_id, "status": "cancelling"}
+
+
+def model_summary(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Public view of a model store catalog record."""
+    return {
+        "name": record["model_name"],
+        "version": record["version"],
+        "run_id": record["run_id"],
+        "created_at": record["created_at"],
+        "path": record["path"],
+        "size": str(record["size"]),
+        "sha256": record["sha256"],
+        "classes": record["classes"],
+        "metrics": record["metrics"]
+    }
+
+
+def resolve_model(model_name: str, version: Optional[int] = None) -> Dict[str, Any]:
+    """Catalog record of a model version (latest if omitted) or 404."""
+    from backend.services.model_store import get_model_store
+
+    record = get_model_store().get(model_name, version)
+    if record is None or not os.path.exists(record["path"]):
+        raise HTTPException(status_code=404, detail="Model not found")
+    return record
+
+
+@app.get("/api/models", response_model=ModelListResponse)
+async def list_models():
+    """List the latest version of every trained model."""
+    from backend.services.model_store import get_model_store
+
+    records = await asyncio.to_thread(get_model_store().list_latest)
+    return {"models": [model_summary(r) for r in records]}
+
+
+@app.get("/api/models/{model_name}/versions", response_model=ModelListResponse)
+async def list_model_versions(model_name: str):
+    """List every stored version of a model, newest first."""
+    from backend.services.model_store import get_model_store
+
+    records = await asyncio.to_thread(get_model_store().list_versions, model_name)
+    if not records:
+        raise HTTPException(status_code=404, detail="Model not found")
+    return {"models": [model_summary(r) for r in records]}
+
+
+# Download chunk size for streamed model artifacts
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def parse_byte_range(header: str, size: int) -> Optional[tuple]:
+    """
+    Parse a single-range "bytes=start-end" header into an inclusive
+    (start, end). Returns None for headers we serve in full (multiple
+    ranges, other units, invalid specs such as start > end); raises 416
+    only for a valid range that starts past the end of the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else None
+        else:
+            # Suffix range: the last N bytes ("bytes=-0" asks for none of them)
+            suffix = int(last)
+            if suffix < 0:
+                return None
+            start = max(0, size - suffix) if suffix > 0 else size
+            end = None
+    except ValueError:
+        return None
+
+    if start < 0 or (end is not None and start > end):
+        return None
+    if end is None:
+        end = size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match comparison: "*" or any listed tag, weak (W/"...") or strong."""
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in (t[2:] if t.startswith("W/") else t for t in tags)
+
+
+def iter_file(path: str, start: int, end: int):
+    """Yield bytes start..end (inclusive) of a file in chunks."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@app.api_route("/api/models/{model_name}/download", methods=["GET", "HEAD"])
+async def download_model(
+    request: Request,
+    model_name: str,
+    version: Optional[int] = None,
+    format: str = "pt"
+):
+    """
+    Download a trained model (latest version unless one is given).
+
+    format: "pt" (raw state_dict), "fp16" (half-precision weights), or
+    "pt.gz" / "fp16.gz" (gzip-compressed). Supports Range requests for
+    resumable downloads and ETag / If-None-Match revalidation. HEAD
+    returns the same headers without the body.
+    """
+    from backend.services.model_store import ARTIFACT_FORMATS, get_model_store
+
+    if format not in ARTIFACT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(ARTIFACT_FORMATS)}")
+
+    record = resolve_model(model_name, version)
+    # Packing fp16 / gzip artifacts happens once per version and may take a while
+    path = await asyncio.to_thread(get_model_store().artifact, record, format)
+    size = os.path.getsize(path)
+
+    # Versions are immutable, so the source hash identifies every derived artifact too
+    etag = f'"{record["sha256"]}-{format}"'
+    filename = f"{model_name}_v{record['version']}{ARTIFACT_FORMATS[format]}"
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        # "latest" can move to a new version, a pinned version never changes
+        "Cache-Control": "no-cache" if version is None else "public, max-age=31536000, immutable"
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    # If-Range: only honour the range if the client's copy is still this artifact
+    if range_header and request.headers.get("if-range", etag) == etag:
+        byte_range = parse_byte_range(range_header, size)
+
+    if byte_range is None:
+        status_code, (start, end) = 200, (0, size - 1)
+    else:
+        status_code, (start, end) = 206, byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+
+    if request.method == "HEAD":
+        return Response(status_code=status_code, media_type="application/octet-stream", headers=headers)
+    return StreamingResponse(
+        iter_file(path, start, end),
+        status_code=status_code,
+        media_type="application/octet-stream",
+        headers=headers
+    )
+
+
+@app.websocket("/ws/logs")
+async def websocket_logs(websocket: WebSocket):
+    """WebSocket endpoint for real-time agent logs."""
+    await manager.connect(websocket)
+    try:
+        while True:
+            # Keep connection alive
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        manager.disconnect(websocket)
+
+
+# ============================================
+# Pipeline Execution
+# ============================================
+
+async def run_pipeline(
+    run_id: str,
+    dataset_path: Optional[str],
+    execution_mode: Optional[str] = None,
+    resume: bool = False,
+    options: Optional[Dict[str, Any]] = None
+):
+    """Run (or resume) the ML pipeline asynchronously, streaming per-node progress."""
+    try:
+        from backend.services.pipeline_service import PipelineService
+
+        service = PipelineService(execution_mode) if execution_mode else PipelineService()
+        active_pipelines[run_id] = service
+
+        async def on_event(event_type: str, data: Dict[str, Any]):
+            await handle_pipeline_event(run_id, event_type, data)
+
+        service.add_callback(on_event)
+        await service.run_pipeline(dataset_path, run_id=run_id, resume=resume, options=options)
+
+    except Exception as e:
+        # Failures raised before the service could emit an event of its own
+        if pipeline_runs[run_id]["status"] == "running":
+            await handle_pipeline_event(run_id, "pipeline_failed", {"error": str(e)})
+    finally:
+        active_pipelines.pop(run_id, None)
+
+
+async def handle_pipeline_event(run_id: str, event_type: str, data: Dict[str, Any]):
+    """Apply a pipeline event to the run record and push it to clients."""
+    from backend.pipeline_graph import STATE_OUTPUT_KEYS
+
+    run = pipeline_runs[run_id]
+
+    if event_type == "pipeline_started":
+        await manager.broadcast({
+            "timestamp": datetime.now().isoformat(),
+            "agent": "orchestrator",
+            "message": f"Pipeline started for dataset: {data['dataset_path']}",
+            "level": "info"
+        })
+
+    elif event_type == "pipeline_resumed":
+        state = data["state"]
+        run.update({key: state.get(key) for key in STATE_OUTPUT_KEYS})
+        run["dataset_path"] = state.get("dataset_path")
+        run["stage_timings"] = dict(state.get("node_timings") or {})
+        run["current_stage"] = data["next_stage"]
+
+        await manager.broadcast({
+            "timestamp": datetime.now().isoformat(),
+            "agent": "orchestrator",
+            "message": f"Pipeline resumed at stage: {data['next_stage']}",
+            "level": "info"
+        })
+
+    elif event_type == "node_completed":
+        node = data["node"]
+        update = data["update"]
+        run.update({key: update[key] for key in STATE_OUTPUT_KEYS if key in update})
+        run["stage_timings"][node] = data["elapsed"]
+        run["current_stage"] = data["next_stage"]
+
+        await manager.broadcast({
+            "timestamp": datetime.now().isoformat(),
+            "agent": "orchestrator",
+            "message": f"{node.replace('_', ' ').title()} finished in {data['elapsed']:.2f}s",
+            "level": "info",
+            "type": "stage_completed",
+            "run_id": run_id,
+            "stage": node,
+            "elapsed": data["elapsed"],
+            "next_stage": data["next_stage"]
+        })
+
+    elif event_type == "pipeline_completed":
+        run.update({
+            "status": "completed",
+            "current_stage": "completed",
+            "completed_at": datetime.now().isoformat()
+        })
+        run.update({key: data.get(key) for key in STATE_OUTPUT_KEYS})
+
+        await manager.broadcast({
+            "timestamp": datetime.now().isoformat(),
+            "agent": "orchestrator",
+            "message": "Pipeline completed successfully! Model ready for testing.",
+            "level": "info"
+        })
+
+    elif event_type == "pipeline_cancelled":
+        run.update({
+            "status": "cancelled",
+            "cancelled_at": datetime.now().isoformat()
+        })
+
+        await manager.broadcast({
+            "timestamp": datetime.now().isoformat(),
+            "agent": "orchestrator",
+            "message": "Pipeline cancelled.",
+            "level": "warning"
+        })
+
+    elif event_type == "pipeline_failed":
+        run.update({
+            "status": "failed",
+            "error": data["error"],
+            "failed_at": datetime.now().isoformat()
+        })
+
+        await manager.broadcast({
+            "timestamp": datetime.now().isoformat(),
+            "agent": "orchestrator",
+            "message": f"Pipeline failed: {data['error']}",
+            "level": "error"
+        })
+
+
+# ============================================
+# Model Testing & XAI
+# ============================================
+
+class ModelTestResponse(BaseModel):
+    predicted_class: int
+    confidence: float
+    explanation: str
+    heatmap_base64: Optional[str] = None  # omitted when overlay=False
+    method: str = "gradcam"
+    probabilities: List[float] = []       # every class, temperature-scaled if calibrated, TTA-averaged if tta
+    class_names: Optional[List[str]] = None
+    calibrated: bool = False
+    tta: bool = False
+
+
+@app.post("/api/models/test", response_model=ModelTestResponse)
+async def test_model(
+    model_name: str = Form(...),
+    file: UploadFile = File(...),
+    version: Optional[int] = Form(None),
+    overlay: bool = Form(True),
+    method: str = Form("gradcam"),
+    tta: bool = Form(False)
+):
+    """
+    Test a model on an uploaded image and generate an explanation heatmap.
+    method: "gradcam" | "gradcam++" | "scorecam" | "integrated_gradients".
+    tta: average logits over flipped / rotated views (one batched pass) for
+    the returned probabilities; the predicted class and heatmap stay those
+    of the plain pass.
+    Probabilities are temperature-scaled when the model was calibrated.
+    """
+    temp_file_path = None
+    try:
+        from backend.services.xai_service import XAI_METHODS, explain_image
+
+        if method not in XAI_METHODS:
+            raise HTTPException(status_code=400, detail=f"method must be one of {list(XAI_METHODS)}")
+        import cv2
+        import base64
+        import numpy as np
+        import shutil
+        
+        # Create temp directory if not exists
+        temp_dir = "temp_uploads"
+        os.makedirs(temp_dir, exist_ok=True)
+        
+        # Save uploaded file
+        temp_file_path = os.path.join(temp_dir, f"{uuid.uuid4()}_{file.filename}")
+        with open(temp_file_path, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+            
+        record = resolve_model(model_name, version)
+            
+        # Generate the explanation and prediction
+        calibration = record["metrics"].get("calibration")
+        overlay_image, predicted_class, confidence, explanation, probabilities = await asyncio.to_thread(
+            explain_image,
+            temp_file_path,
+            model_name,
+            record["path"],
+            method=method,
+            class_names=record["classes"],
+            with_overlay=overlay,
+            calibration=calibration,
+            tta=tta
+        )
+        
+        # Encode overlay image to base64
+        heatmap_base64 = None
+        if overlay_image is not None:
+            _, buffer = cv2.imencode('.jpg', overlay_image)
+            heatmap_base64 = f"data:image/jpeg;base64,{base64.b64encode(buffer).decode('utf-8')}"
+        
+        return {
+            "predicted_class": predicted_class,
+            "confidence": float(confidence),
+            "explanation": explanation,
+            "heatmap_base64": heatmap_base64,
+            "method": method,
+            "probabilities": probabilities,
+            "class_names": record["classes"],
+            "calibrated": calibration is not None,
+            "tta": tta
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error testing model: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Cleanup temp file
+        if temp_file_path and os.path.exists(temp_file_path):
+            try:
+                os.remove(temp_file_path)
+            except:
+                pass
+
+
+# ============================================
+# Background Log Processor
+# ============================================
+
+async def log_processor():
+    """Process logs from the queue and broadcast them via WebSocket."""
+    from backend.logger import log_queue
+    while True:
+        try:
+            # Non-blocking get from queue
+            # We use a small sleep to avoid busy waiting if queue is empty
+            if not log_queue.empty():
+                log_entry = log_queue.get_nowait()
+                await manager.broadcast(log_entry)
+            else:
+                await asyncio.sleep(0.1)
+        except Exception as e:
+            print(f"Error in log processor: {e}")
+            await asyncio.sleep(1)
+
+@app.on_event("startup")
+async def startup_event():
+    asyncio.create_task(log_processor())
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,66 @@
+"""
+Scaling benchmark for multi-process CPU training (DDP over gloo).
+
+Trains one epoch on a synthetic ImageFolder with 1, 2, 4 and 8 processes
+and reports training throughput and speedup over a single process.
+Throughput is measured over the epoch itself (slowest rank), so process
+spawn, imports and model construction are reported separately as setup.
+
+Usage:
+    python -m backend.benchmarks.ddp_scaling [--images 512] [--model mobilenet]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from backend.benchmarks.synthetic_data import make_image_folder
+from backend.tools.distributed_training import train_distributed
+from backend.tools.training import cpu_budget
+
+AUG_PLAN = {"rotation": 10, "flip": True, "color_jitter": "none"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DDP (gloo) CPU scaling benchmark")
+    parser.add_argument("--images", type=int, default=512, help="training images")
+    parser.add_argument("--model", default="mobilenet", choices=["resnet", "efficientnet", "mobilenet"])
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    cpus = cpu_budget()
+    print(f"CPUs: {cpus}  model: {args.model}  images: {args.images}")
+
+    with tempfile.TemporaryDirectory(prefix="automed_bench_") as tmp_dir:
+        # test_fraction=0 so every generated image is trained on
+        dataset_path = make_image_folder(os.path.join(tmp_dir, "data"), args.images, test_fraction=0)
+        result_path = os.path.join(tmp_dir, "result.pt")
+
+        baseline = None
+        print(f"\n{'procs':>5}  {'threads/proc':>12}  {'setup s':>8}  {'epoch s':>8}  {'img/s':>8}  {'speedup':>7}")
+        for world_size in args.processes:
+            if world_size > cpus:
+                print(f"{world_size:>5}  skipped (only {cpus} CPUs)")
+                continue
+
+            start = time.perf_counter()
+            result = train_distributed(
+                dataset_path, AUG_PLAN, args.model, 2, ["class_0", "class_1"], result_path, world_size,
+                num_epochs=1,
+                batch_size=args.batch_size
+            )
+            elapsed = time.perf_counter() - start
+
+            epoch = result["epochs"][-1]
+            throughput = epoch["images"] / epoch["seconds"]
+            baseline = baseline or throughput
+            threads = max(1, cpu_budget() // world_size)
+            print(
+                f"{world_size:>5}  {threads:>12}  {elapsed - epoch['seconds']:>8.1f}  {epoch['seconds']:>8.1f}  "
+                f"{throughput:>8.1f}  {throughput / baseline:>6.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+End-to-end benchmark: inspection, training and inference on synthetic
+ImageFolders of several sizes, with the per-stage metrics recorded by
+backend.metrics (decode rate, dataloader wait, batch step time, model
+load, explanation latency).
+
+Results are written as JSON so later runs can be compared against a
+stored baseline; --compare exits with code 1 if any stage got slower
+than the allowed tolerance.
+
+Usage:
+    python -m backend.benchmarks.e2e [--sizes 64 256 1024] [--model mobilenet]
+        [--output .benchmarks/e2e.json] [--compare baseline.json] [--tolerance 0.2]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+AUG_PLAN = {"rotation": 10, "flip": True, "color_jitter": "low"}
+
+# Stage timings that are compared against a baseline (lower is better)
+COMPARED_STAGES = ("inspection_seconds", "training_seconds", "inference_ms_per_image", "explanation_ms_per_image")
+
+
+def histogram_mean(snapshot, key):
+    entry = snapshot.get(key)
+    if not entry or not entry["count"]:
+        return None
+    return entry["sum"] / entry["count"]
+
+
+def run_size(num_images, model_name, inference_images):
+    """Run every stage on a fresh synthetic dataset; returns the stage results."""
+    from backend import metrics
+    from backend.agents.model_trainer_agent import model_trainer_node
+    from backend.benchmarks.synthetic_data import make_image_folder
+    from backend.services.xai_service import explain_image, test_model_inference
+    from backend.tools.data_inspector import analyze_dataset, scan_dataset
+
+    metrics.reset()
+    result = {"images": num_images}
+
+    dataset_path = make_image_folder(os.path.join(os.getcwd(), f"data_{num_images}"), num_images)
+
+    start = time.perf_counter()
+    entries = scan_dataset(dataset_path)
+    stats = analyze_dataset(dataset_path, entries)
+    result["inspection_seconds"] = time.perf_counter() - start
+    result["inspection_images_per_second"] = len(entries) / result["inspection_seconds"]
+
+    state = {
+        "dataset_path": dataset_path,
+        "run_id": None,
+        "dataset_stats": stats,
+        "aug_plan": AUG_PLAN,
+        "selected_model": {"selected_model": model_name},
+    }
+    start = time.perf_counter()
+    state = model_trainer_node(state)
+    result["training_seconds"] = time.perf_counter() - start
+    model_path = state["model_results"]["model_path"]
+
+    test_images = [path for split, _, path in entries if split == "test"][:inference_images]
+    start = time.perf_counter()
+    for path in test_images:
+        test_model_inference(path, model_name, model_path)
+    result["inference_ms_per_image"] = (time.perf_counter() - start) * 1000 / max(len(test_images), 1)
+
+    start = time.perf_counter()
+    for path in test_images:
+        explain_image(path, model_name, model_path, "gradcam")
+    result["explanation_ms_per_image"] = (time.perf_counter() - start) * 1000 / max(len(test_images), 1)
+
+    snapshot = metrics.snapshot()
+    result["train_images_per_second"] = snapshot.get("automed_train_images_per_second")
+    result["dataloader_wait_ms"] = (histogram_mean(snapshot, "automed_dataloader_wait_seconds") or 0) * 1000
+    result["train_batch_ms"] = (histogram_mean(snapshot, "automed_train_batch_seconds") or 0) * 1000
+    result["model_load_ms"] = (histogram_mean(snapshot, f'automed_model_load_seconds{{model="{model_name}"}}') or 0) * 1000
+    result["metrics"] = snapshot
+
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """Print per-stage deltas against a baseline; returns the regressions."""
+    previous = {run["images"]: run for run in baseline["runs"]}
+    regressions = []
+
+    print(f"\nComparison with {baseline['timestamp']} (tolerance {tolerance:.0%}):")
+    for run in results["runs"]:
+        base = previous.get(run["images"])
+        if base is None:
+            continue
+        for stage in COMPARED_STAGES:
+            if not base.get(stage):
+                continue
+            change = run[stage] / base[stage] - 1
+            flag = "REGRESSION" if change > tolerance else ""
+            print(f"  {run['images']:>6} images  {stage:<26} {base[stage]:>10.2f} -> {run[stage]:>10.2f}  {change:+7.1%}  {flag}")
+            if flag:
+                regressions.append((run["images"], stage, change))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024], help="dataset sizes (images)")
+    parser.add_argument("--model", default="mobilenet", choices=["resnet", "efficientnet", "mobilenet"])
+    parser.add_argument("--inference-images", type=int, default=16)
+    parser.add_argument("--output", default=os.path.join(".benchmarks", f"e2e-{datetime.now():%Y%m%d-%H%M%S}.json"))
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown per stage (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    # Datasets, models and caches are written to a scratch working directory
+    # so a benchmark never touches the real model store
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="automed_e2e_") as tmp_dir:
+        os.chdir(tmp_dir)
+        try:
+            runs = []
+            for size in args.sizes:
+                print(f"Running {size} images...")
+                run = run_size(size, args.model, args.inference_images)
+                runs.append(run)
+                print(
+                    f"  inspect {run['inspection_seconds']:.1f}s ({run['inspection_images_per_second']:.0f} img/s)  "
+                    f"train {run['training_seconds']:.1f}s ({run['train_images_per_second'] or 0:.1f} img/s, "
+                    f"wait {run['dataloader_wait_ms']:.1f} ms/batch, step {run['train_batch_ms']:.1f} ms/batch)  "
+                    f"infer {run['inference_ms_per_image']:.1f} ms/img  explain {run['explanation_ms_per_image']:.1f} ms/img"
+                )
+        finally:
+            # Leave the scratch directory before it is removed, even if a run failed
+            os.chdir(cwd)
+
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "model": args.model,
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "runs": runs,
+    }
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if baseline_path:
+        with open(baseline_path, "r") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
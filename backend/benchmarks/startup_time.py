@@ -0,0 +1,101 @@
+"""
+Startup-time benchmark for the API import graph.
+
+Imports each module in a fresh interpreter with `python -X importtime`,
+reports the slowest imports, and fails (exit code 1) if the total import
+time exceeds the budget or a heavy ML dependency is imported eagerly.
+
+Usage:
+    python -m backend.benchmarks.startup_time [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules whose import must stay cheap
+STARTUP_MODULES = (
+    "backend.api",
+    "backend.services",
+    "backend.services.pipeline_service",
+    "backend.pipeline_graph",
+)
+
+# Heavy dependencies that may only be loaded on first use
+LAZY_MODULES = ("torch", "torchvision", "cv2", "google.generativeai", "sklearn")
+
+DEFAULT_BUDGET_MS = float(os.getenv("AUTOMED_STARTUP_BUDGET_MS", "1500"))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def measure_import(module):
+    """
+    Import `module` in a fresh interpreter.
+    Returns (total_ms, [(cumulative_ms, name)], eagerly loaded heavy modules).
+    """
+    code = (
+        f"import sys, {module}\n"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+
+    imports = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative_us = int(cumulative)
+        imports.append((cumulative_us / 1000, name.strip()))
+        # Top-level imports have a single leading space; nested ones are indented
+        # further, and the top-level cumulative times add up to the total
+        if len(name) - len(name.lstrip()) == 1:
+            total_us += cumulative_us
+
+    eager = [m for m in result.stdout.strip().split(",") if m]
+    return total_us / 1000, sorted(imports, reverse=True), eager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API import time")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to show")
+    args = parser.parse_args()
+
+    failures = []
+    for module in STARTUP_MODULES:
+        try:
+            total_ms, imports, eager = measure_import(module)
+        except RuntimeError as e:
+            failures.append(str(e))
+            continue
+
+        print(f"\n{module}: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+        for cumulative_ms, name in imports[:args.top]:
+            print(f"  {cumulative_ms:8.1f} ms  {name}")
+
+        if total_ms > args.budget_ms:
+            failures.append(f"{module} took {total_ms:.0f} ms (> {args.budget_ms:.0f} ms)")
+        if eager:
+            failures.append(f"{module} eagerly imports {', '.join(eager)}")
+
+    if failures:
+        print("\nFAILED:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+    print("\nOK: all modules within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Synthetic ImageFolder generator for benchmarks.
+
+Writes random RGB images in the layout the pipeline expects:
+root/{train,test}/class_{k}/img_{i}.png
+"""
+import os
+
+import numpy as np
+from PIL import Image
+
+
+def make_image_folder(root, num_images, num_classes=2, image_size=256, test_fraction=0.2, seed=0):
+    """Create a synthetic dataset with `num_images` images in total; returns root."""
+    rng = np.random.default_rng(seed)
+    num_test = int(num_images * test_fraction)
+    splits = {"train": num_images - num_test, "test": num_test}
+
+    for split, count in splits.items():
+        for i in range(count):
+            class_dir = os.path.join(root, split, f"class_{i % num_classes}")
+            os.makedirs(class_dir, exist_ok=True)
+            pixels = rng.integers(0, 256, size=(image_size, image_size, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(os.path.join(class_dir, f"img_{i}.png"))
+
+    return root
@@ -0,0 +1,73 @@
+"""
+CPU latency benchmark for the explanation methods.
+
+Builds an untrained model of each architecture, then for every method
+reports the cold latency (first explanation of an image, including the
+shared forward/backward pass) and the warm latency (same image again,
+reusing the cached pass). Overlay rendering is included.
+
+Usage:
+    python -m backend.benchmarks.xai_latency [--models resnet mobilenet] [--repeats 3]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import torch
+from PIL import Image
+
+from backend.services import xai_service
+from backend.tools.training import build_model
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="XAI method latency benchmark (CPU)")
+    parser.add_argument("--models", nargs="+", default=["resnet", "efficientnet", "mobilenet"])
+    parser.add_argument("--methods", nargs="+", default=list(xai_service.XAI_METHODS))
+    parser.add_argument("--repeats", type=int, default=3, help="distinct images per method")
+    parser.add_argument("--image-size", type=int, default=512)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}  torch threads: {torch.get_num_threads()}")
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory(prefix="automed_bench_") as tmp_dir:
+        images = []
+        for i in range(args.repeats):
+            path = os.path.join(tmp_dir, f"img_{i}.png")
+            pixels = rng.integers(0, 256, size=(args.image_size, args.image_size, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(path)
+            images.append(path)
+
+        print(f"\n{'model':<13} {'method':<22} {'cold ms':>9} {'warm ms':>9}")
+        for model_name in args.models:
+            model_path = os.path.join(tmp_dir, f"{model_name}.pt")
+            torch.save(build_model(model_name, 2, pretrained=False).state_dict(), model_path)
+            # Model loading is a one-off per process; keep it out of the numbers
+            xai_service.get_loaded_model(model_name, model_path)
+
+            for method in args.methods:
+                cold, warm = [], []
+                for path in images:
+                    xai_service._forward_cache.clear()
+                    explain = lambda: xai_service.explain_image(path, model_name, model_path, method)
+                    cold.append(timed(explain))
+                    # Warm: forward pass cached, heatmap recomputed
+                    for forward in xai_service._forward_cache.values():
+                        forward.heatmaps.clear()
+                    warm.append(timed(explain))
+
+                print(f"{model_name:<13} {method:<22} {statistics.median(cold):>9.1f} {statistics.median(warm):>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Cooperative cancellation of pipeline runs executing in a thread of the
+API process. Process-mode runs are stopped by terminating their worker;
+thread-mode runs can only stop themselves, so long-running nodes call
+check(run_id) between units of work (training epochs, sweep rungs).
+"""
+import threading
+
+_lock = threading.Lock()
+_events = {}  # run_id -> threading.Event set by PipelineService.cancel()
+
+
+class PipelineCancelled(Exception):
+    """Raised when a pipeline run is cancelled before it finishes."""
+
+
+def register(run_id, event):
+    if run_id is not None:
+        with _lock:
+            _events[run_id] = event
+
+
+def unregister(run_id):
+    with _lock:
+        _events.pop(run_id, None)
+
+
+def check(run_id):
+    """Raise PipelineCancelled if the run has been cancelled."""
+    with _lock:
+        event = _events.get(run_id)
+    if event is not None and event.is_set():
+        raise PipelineCancelled("Pipeline run was cancelled")
@@ -1,18 +1,45 @@
-import queue
-from datetime import datetime
-
-# Thread-safe queue for logs
-log_queue = queue.Queue()
-
-def send_log(agent: str, message: str, level: str = "info"):
-    """
-    Add a log message to the queue.
-    This is called by agents running in a separate thread.
-    """
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "agent": agent,
-        "message": message,
-        "level": level
-    }
-    log_queue.put(log_entry)
+import queue
+from datetime import datetime
+
+# Thread-safe queue for logs
+log_queue = queue.Queue()
+_local_queue = log_queue
+
+def send_log(agent: str, message: str, level: str = "info"):
+    """
+    Add a log message to the queue.
+    This is called by agents running in a separate thread.
+    """
+    log_entry = {
+        "timestamp": datetime.now().isoformat(),
+        "agent": agent,
+        "message": message,
+        "level": level
+    }
+    log_queue.put(log_entry)
+
+
+def redirect_logs(sink):
+    """
+    Route send_log entries to `sink` (any object with a put() method).
+    Used by worker processes to forward logs back to the API process.
+    """
+    global log_queue
+    log_queue = sink
+
+
+def logs_redirected():
+    """True in processes whose logs are forwarded to a parent process."""
+    return log_queue is not _local_queue
+
+
+def dispatch(entry):
+    """
+    Handle an entry forwarded by a child process: metric entries go to the
+    metrics registry (or further up), everything else to the log queue.
+    """
+    if entry.get("type") == "metric":
+        from backend import metrics
+        metrics.record(entry)
+    else:
+        log_queue.put(entry)
@@ -0,0 +1,130 @@
+"""
+Structured metrics: counters, gauges and timing histograms with
+Prometheus text exposition (served at /metrics).
+
+Processes whose logs are redirected to a parent (pipeline worker, DDP
+rank 0) forward metric entries through the same queue as their logs;
+the parent records them with logger.dispatch(). Metrics from any
+process therefore end up in the API process's registry.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from backend import logger
+
+# Help text of every metric (also the list of what is exported)
+METRICS = {
+    "automed_node_seconds": ("histogram", "Wall time of a pipeline node"),
+    "automed_pipeline_runs_total": ("counter", "Pipeline runs by final status"),
+    "automed_images_decoded_total": ("counter", "Images decoded, by stage"),
+    "automed_decode_seconds_total": ("counter", "Time spent decoding images, by stage"),
+    "automed_planner_requests_total": ("counter", "Planner decisions by agent and source (cache, rules, gemini, fallback)"),
+    "automed_train_batch_seconds": ("histogram", "Forward, backward and optimizer step time of a training batch"),
+    "automed_dataloader_wait_seconds": ("histogram", "Time the training loop waited for the next batch"),
+    "automed_train_images_per_second": ("gauge", "Training throughput of the last epoch"),
+    "automed_model_load_seconds": ("histogram", "Time to load model weights for inference"),
+    "automed_xai_forward_seconds": ("histogram", "Shared forward/backward pass of an explanation"),
+    "automed_xai_forward_cache_total": ("counter", "Explanation forward-pass cache lookups by result"),
+    "automed_xai_seconds": ("histogram", "Explanation latency by method (heatmap, prediction and overlay)"),
+}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_lock = threading.Lock()
+_values = {}      # counters and gauges: (name, labels) -> value
+_histograms = {}  # (name, labels) -> [bucket counts, sum, count]
+
+
+def inc(name, value=1.0, **labels):
+    record({"type": "metric", "kind": "counter", "name": name, "value": value, "labels": labels})
+
+
+def set_gauge(name, value, **labels):
+    record({"type": "metric", "kind": "gauge", "name": name, "value": value, "labels": labels})
+
+
+def observe(name, value, **labels):
+    record({"type": "metric", "kind": "histogram", "name": name, "value": value, "labels": labels})
+
+
+@contextmanager
+def timer(name, **labels):
+    """Observe the wall time of a block (in seconds) into a histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def record(entry):
+    """Apply a metric entry here, or forward it if this process reports to a parent."""
+    if logger.logs_redirected():
+        logger.log_queue.put(entry)
+        return
+
+    key = (entry["name"], tuple(sorted((k, str(v)) for k, v in entry["labels"].items())))
+    value = float(entry["value"])
+    with _lock:
+        if entry["kind"] == "counter":
+            _values[key] = _values.get(key, 0.0) + value
+        elif entry["kind"] == "gauge":
+            _values[key] = value
+        else:
+            buckets, total, count = _histograms.get(key) or [[0] * len(DEFAULT_BUCKETS), 0.0, 0]
+            for i, bound in enumerate(DEFAULT_BUCKETS):
+                if value <= bound:
+                    buckets[i] += 1
+            _histograms[key] = [buckets, total + value, count + 1]
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def render():
+    """Registry in the Prometheus text exposition format."""
+    with _lock:
+        values = dict(_values)
+        histograms = {k: (list(v[0]), v[1], v[2]) for k, v in _histograms.items()}
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (metric, labels), value in sorted(values.items()):
+            if metric == name:
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, bucket_count in zip(DEFAULT_BUCKETS, buckets):
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', f'{bound:g}')])} {bucket_count}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total:g}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+def snapshot():
+    """
+    Plain-dict view for benchmarks: {"name{labels}": value} for counters
+    and gauges, {"name{labels}": {"sum", "count"}} for histograms.
+    """
+    with _lock:
+        result = {f"{name}{_format_labels(labels)}": value for (name, labels), value in _values.items()}
+        for (name, labels), (_, total, count) in _histograms.items():
+            result[f"{name}{_format_labels(labels)}"] = {"sum": total, "count": count}
+    return result
+
+
+def reset():
+    with _lock:
+        _values.clear()
+        _histograms.clear()
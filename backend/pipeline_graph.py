@@ -1,36 +1,170 @@
-from langgraph.graph import StateGraph
-from backend.pipeline_state import PipelineState
-
-# Import agents
-from backend.agents.data_inspector_agent import data_inspector_node
-from backend.agents.augmentation_agent import augmentation_agent_node
-from backend.agents.model_selection_agent import model_selection_agent_node
-from backend.agents.model_trainer_agent import model_trainer_node
-
-
-def build_pipeline():
-    # Initialize graph with our state type
-    graph = StateGraph(PipelineState)
-
-    # Add agent nodes
-    graph.add_node("data_inspector", data_inspector_node)
-    graph.add_node("augmentation", augmentation_agent_node)
-    graph.add_node("model_selector", model_selection_agent_node)
-    graph.add_node("trainer", model_trainer_node)
-
-    # Connect nodes in order
-    graph.add_edge("data_inspector", "augmentation")
-    graph.add_edge("augmentation", "model_selector")
-    graph.add_edge("model_selector", "trainer")
-
-    # Entry point
-    graph.set_entry_point("data_inspector")
-
-    # End at model trainer
-    graph.set_finish_point("trainer")
-
-    # Compile graph into runnable pipeline
-    return graph.compile()
-
-
-test_pipeline = build_pipeline()
+import importlib
+import os
+import sqlite3
+import time
+from functools import lru_cache
+from backend import metrics
+from backend.logger import send_log
+from backend.pipeline_state import PipelineState
+
+# Agent nodes as (module, function); modules are imported on first call so
+# torch, cv2 and genai stay out of the API's import time
+AGENT_NODES = {
+    "data_inspector": ("backend.agents.data_inspector_agent", "data_inspector_node"),
+    "augmentation": ("backend.agents.augmentation_agent", "augmentation_agent_node"),
+    "model_selector": ("backend.agents.model_selection_agent", "model_selection_agent_node"),
+    "trainer": ("backend.agents.model_trainer_agent", "model_trainer_node"),
+}
+
+
+# Stage names in execution order (used to report progress);
+# augmentation and model_selector run in parallel
+PIPELINE_STAGES = ("data_inspector", "augmentation", "model_selector", "trainer")
+
+# State keys produced by the agents and surfaced on a run record
+STATE_OUTPUT_KEYS = ("dataset_stats", "aug_plan", "selected_model", "model_results")
+
+# Stage-level checkpoints of PipelineState, keyed by run_id
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_DB = os.path.join(CHECKPOINT_DIR, "pipeline.sqlite")
+
+# Pseudo node name under which stream_updates() reports a resumed state
+RESUMED_NODE = "__resumed__"
+
+
+def timed_node(name, node):
+    """Wrap a node so its wall time is recorded in state["node_timings"] and metrics."""
+    def run(state):
+        start = time.perf_counter()
+        update = dict(node(state))
+        elapsed = time.perf_counter() - start
+        update["node_timings"] = {name: round(elapsed, 3)}
+        metrics.observe("automed_node_seconds", elapsed, node=name)
+        return update
+
+    return run
+
+
+def lazy_node(module_name, func_name):
+    """Node that imports its agent module on first call."""
+    def run(state):
+        node = getattr(importlib.import_module(module_name), func_name)
+        return node(state)
+
+    return run
+
+
+def next_stage(completed_stages):
+    """Return the first stage that has not finished yet, or "completed"."""
+    for stage in PIPELINE_STAGES:
+        if stage not in completed_stages:
+            return stage
+    return "completed"
+
+
+def build_pipeline(checkpointer=None):
+    from langgraph.graph import StateGraph
+
+    # Initialize graph with our state type
+    graph = StateGraph(PipelineState)
+
+    # Add agent nodes
+    for name, (module_name, func_name) in AGENT_NODES.items():
+        graph.add_node(name, timed_node(name, lazy_node(module_name, func_name)))
+
+    # Both planners only need dataset_stats: fan out, then join at the trainer
+    graph.add_edge("data_inspector", "augmentation")
+    graph.add_edge("data_inspector", "model_selector")
+    graph.add_edge(["augmentation", "model_selector"], "trainer")
+
+    # Entry point
+    graph.set_entry_point("data_inspector")
+
+    # End at model trainer
+    graph.set_finish_point("trainer")
+
+    # Compile graph into runnable pipeline
+    return graph.compile(checkpointer=checkpointer)
+
+
+@lru_cache(maxsize=1)
+def checkpoints_durable():
+    """True if checkpoints outlive the process (needs langgraph-checkpoint-sqlite)."""
+    try:
+        import langgraph.checkpoint.sqlite  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_checkpointer():
+    """
+    SQLite-backed LangGraph checkpointer. Without langgraph-checkpoint-sqlite
+    it falls back to an in-memory one, with a warning: runs are not resumable.
+    """
+    if not checkpoints_durable():
+        from langgraph.checkpoint.memory import MemorySaver
+        send_log(
+            "pipeline",
+            "langgraph-checkpoint-sqlite is not installed: checkpoints are kept in memory "
+            "and runs cannot be resumed.",
+            level="warning"
+        )
+        return MemorySaver()
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    return SqliteSaver(sqlite3.connect(CHECKPOINT_DB, check_same_thread=False))
+
+
+@lru_cache(maxsize=1)
+def default_pipeline():
+    """Pipeline without checkpointing, compiled on first use."""
+    return build_pipeline()
+
+
+@lru_cache(maxsize=1)
+def checkpointed_pipeline():
+    """Pipeline that checkpoints the state after every node."""
+    return build_pipeline(checkpointer=build_checkpointer())
+
+
+def stream_updates(state, run_id=None, resume=False):
+    """
+    Run the pipeline, yielding (node, update) as each node finishes.
+
+    With a run_id the state is checkpointed after every node. With
+    resume=True the run continues from its last checkpoint: the saved
+    state is yielded first as (RESUMED_NODE, values), then only the
+    stages that had not completed are executed.
+    """
+    if run_id is None:
+        pipeline, config = default_pipeline(), None
+    else:
+        pipeline = checkpointed_pipeline()
+        config = {"configurable": {"thread_id": run_id}}
+
+    if resume:
+        if run_id is None:
+            raise ValueError("Resuming requires a run_id")
+
+        snapshot = pipeline.get_state(config)
+        if not snapshot.values:
+            raise ValueError(f"No checkpoint found for run {run_id}")
+
+        yield RESUMED_NODE, dict(snapshot.values)
+        state = None  # continue from the checkpoint
+    elif run_id is not None:
+        state = {**state, "run_id": run_id}
+
+    for chunk in pipeline.stream(state, config, stream_mode="updates"):
+        for node, update in chunk.items():
+            yield node, update
+
+
+def __getattr__(name):
+    # `test_pipeline` is kept as a lazily compiled module attribute
+    if name == "test_pipeline":
+        return default_pipeline()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,24 +1,44 @@
-from typing import TypedDict, Dict, Any
-
-
-class PipelineState(TypedDict, total=False):
-    # INPUT
-    dataset_path: str
-
-    # AGENT 1 OUTPUT — Data Inspector
-    dataset_stats: Dict[str, Any]        # size, blur, noise, class_dist, etc.
-
-    # AGENT 2 OUTPUT — Augmentation Planner
-    aug_plan: Dict[str, Any]            # rotation, flip, color_jitter
-
-    # AGENT 3 OUTPUT — Model Selection Agent
-    selected_model: Dict[str, Any]      # {"selected_model": "...", "reason": "..."}
-
-    # AGENT 4 OUTPUT — Model Trainer
-    model_results: Dict[str, Any]       # accuracy, f1, model_path
-
-    # OPTIONAL: Grad-CAM / Explainability Agent
-    explain_result: Dict[str, Any]
-
-    # OPTIONAL: Feedback from AI Engineer
-    engineer_feedback: Dict[str, Any]
+from typing import TypedDict, Dict, Any, Annotated
+
+
+def merge_dicts(left: Dict[str, Any], right: Dict[str, Any]) -> Dict[str, Any]:
+    """Reducer that merges per-node dict updates instead of overwriting them."""
+    return {**(left or {}), **(right or {})}
+
+
+class PipelineState(TypedDict, total=False):
+    # INPUT
+    dataset_path: str
+    run_id: str                          # enables stage / epoch checkpoints
+
+    # RUN OPTIONS
+    llm_cache_bypass: bool               # ignore cached planner responses
+    incremental: bool                    # fine-tune the previous model on new images
+    train_processes: int                 # >1 = DDP (gloo) training on CPU
+    balanced_sampling: Any               # "auto" (from imbalance_ratio) | True | False
+    class_weighted_loss: bool            # inverse-frequency weights in the loss
+    sweep: bool                          # successive-halving sweep instead of one model
+
+    # AGENT 1 OUTPUT — file index: {"train/cls/img.jpg": [size, mtime_ns]}
+    file_index: Dict[str, Any]
+
+    # AGENT 1 OUTPUT — Data Inspector
+    dataset_stats: Dict[str, Any]        # size, blur, noise, class_dist, etc.
+
+    # AGENT 2 OUTPUT — Augmentation Planner
+    aug_plan: Dict[str, Any]            # rotation, flip, color_jitter
+
+    # AGENT 3 OUTPUT — Model Selection Agent
+    selected_model: Dict[str, Any]      # {"selected_model": "...", "reason": "..."}
+
+    # AGENT 4 OUTPUT — Model Trainer
+    model_results: Dict[str, Any]       # accuracy, f1, model_path
+
+    # OPTIONAL: Grad-CAM / Explainability Agent
+    explain_result: Dict[str, Any]
+
+    # OPTIONAL: Feedback from AI Engineer
+    engineer_feedback: Dict[str, Any]
+
+    # INSTRUMENTATION: wall time (seconds) per finished node
+    node_timings: Annotated[Dict[str, float], merge_dicts]
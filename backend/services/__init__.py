@@ -1,5 +1,23 @@
-"""Initialize services package."""
-from .xai_service import generate_gradcam, test_model_inference
-from .pipeline_service import PipelineService
-
-__all__ = ["generate_gradcam", "test_model_inference", "PipelineService"]
+"""Initialize services package.
+
+Exports are resolved lazily so importing the package does not pull in
+torch, torchvision and cv2 (see PEP 562).
+"""
+import importlib
+
+_EXPORTS = {
+    "generate_gradcam": "backend.services.xai_service",
+    "explain_image": "backend.services.xai_service",
+    "test_model_inference": "backend.services.xai_service",
+    "PipelineService": "backend.services.pipeline_service",
+    "ModelStore": "backend.services.model_store",
+    "get_model_store": "backend.services.model_store",
+}
+
+__all__ = ["generate_gradcam", "explain_image", "test_model_inference", "PipelineService", "ModelStore", "get_model_store"]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
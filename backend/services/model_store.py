@@ -0,0 +1,334 @@
+"""
+Versioned model artifact store.
+
+Every training run publishes a new immutable version of a model:
+models/{model_name}/v{version}.pt plus a row in a SQLite catalog
+(models/catalog.sqlite) holding run_id, timestamp, metrics, dataset
+fingerprint, class map, size and content hash. Listing and lookup are
+indexed catalog queries; files are written atomically and only become
+visible through the catalog once complete.
+"""
+import glob
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+MODELS_DIR = "models"
+CATALOG_NAME = "catalog.sqlite"
+
+# Versions kept per model by gc() (the latest is never removed)
+KEEP_VERSIONS = int(os.getenv("AUTOMED_MODEL_KEEP_VERSIONS", "5"))
+
+# Download formats: raw pickle, fp16-packed weights, and gzip of either
+ARTIFACT_FORMATS = {
+    "pt": ".pt",
+    "fp16": ".fp16.pt",
+    "pt.gz": ".pt.gz",
+    "fp16.gz": ".fp16.pt.gz",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    model_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    run_id TEXT,
+    created_at TEXT NOT NULL,
+    metrics TEXT,
+    dataset_fingerprint TEXT,
+    classes TEXT,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (model_name, version)
+)
+"""
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(file_index: Dict[str, Any]) -> Optional[str]:
+    """Stable hash of the inspector's file index (None if there is none)."""
+    if not file_index:
+        return None
+    payload = json.dumps(file_index, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ModelStore:
+    """Versioned model artifacts with a SQLite catalog."""
+
+    def __init__(self, root: str = MODELS_DIR):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.catalog_path = os.path.join(root, CATALOG_NAME)
+        # One lock per artifact path, so concurrent first downloads pack it once
+        self._pack_locks: Dict[str, threading.Lock] = {}
+        self._pack_locks_guard = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(SCHEMA)
+            is_empty = conn.execute("SELECT COUNT(*) FROM versions").fetchone()[0] == 0
+        if is_empty:
+            self._adopt_legacy_models()
+
+    def _adopt_legacy_models(self):
+        """
+        Register pre-store models/{name}_model.pt files as version 1,
+        carrying over their classes and incremental-training file index.
+        """
+        for filename in sorted(os.listdir(self.root)):
+            if not filename.endswith("_model.pt"):
+                continue
+
+            model_name = filename[:-len("_model.pt")]
+            path = os.path.join(self.root, filename)
+            classes = None
+            classes_path = os.path.join(self.root, f"{model_name}_classes.json")
+            if os.path.exists(classes_path):
+                with open(classes_path, "r") as f:
+                    classes = json.load(f)
+
+            index = {}
+            index_path = os.path.join(self.root, f"{model_name}_index.json")
+            if os.path.exists(index_path):
+                with open(index_path, "r") as f:
+                    index = json.load(f)
+                files_path = f"{os.path.splitext(path)[0]}.files.json"
+                self._atomic_write(files_path, lambda f: f.write(json.dumps(index.get("files", {})).encode("utf-8")))
+
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO versions VALUES (?, 1, NULL, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        model_name,
+                        datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+                        json.dumps(index.get("results", {})),
+                        dataset_fingerprint(index.get("files")),
+                        json.dumps(classes) if classes is not None else None,
+                        path,
+                        os.path.getsize(path),
+                        file_sha256(path),
+                    )
+                )
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation: safe across threads and processes
+        conn = sqlite3.connect(self.catalog_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commit, or roll back on error
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _record(row) -> Dict[str, Any]:
+        record = dict(row)
+        record["metrics"] = json.loads(record["metrics"]) if record["metrics"] else {}
+        record["classes"] = json.loads(record["classes"]) if record["classes"] else None
+        record["files_path"] = f"{os.path.splitext(record['path'])[0]}.files.json"
+        return record
+
+    def save(
+        self,
+        model_name: str,
+        state_dict,
+        classes: List[str],
+        metrics: Optional[Dict[str, Any]] = None,
+        run_id: Optional[str] = None,
+        file_index: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Publish a new version and return its catalog record."""
+        import torch
+
+        model_dir = os.path.join(self.root, model_name)
+        os.makedirs(model_dir, exist_ok=True)
+
+        # Write, sync and hash before taking the catalog lock: it only covers rename + INSERT
+        staged = os.path.join(model_dir, f"staged.{uuid.uuid4().hex}")
+        weights_tmp = f"{staged}.pt.tmp"
+        files_tmp = f"{staged}.files.json.tmp" if file_index is not None else None
+        try:
+            self._write_synced(weights_tmp, lambda f: torch.save(state_dict, f))
+            if files_tmp is not None:
+                self._write_synced(files_tmp, lambda f: f.write(json.dumps(file_index).encode("utf-8")))
+            size, sha256 = os.path.getsize(weights_tmp), file_sha256(weights_tmp)
+
+            with self._connect() as conn:
+                # Reserve the version number under a write lock
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT COALESCE(MAX(version), 0) FROM versions WHERE model_name = ?", (model_name,)
+                ).fetchone()
+                version = row[0] + 1
+                path = os.path.join(model_dir, f"v{version}.pt")
+
+                os.replace(weights_tmp, path)
+                if files_tmp is not None:
+                    os.replace(files_tmp, os.path.join(model_dir, f"v{version}.files.json"))
+
+                conn.execute(
+                    "INSERT INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        model_name,
+                        version,
+                        run_id,
+                        datetime.now().isoformat(),
+                        json.dumps(metrics or {}),
+                        dataset_fingerprint(file_index),
+                        json.dumps(classes),
+                        path,
+                        size,
+                        sha256,
+                    )
+                )
+        finally:
+            for tmp_path in (weights_tmp, files_tmp):
+                if tmp_path is not None and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        return self.get(model_name, version)
+
+    @staticmethod
+    def _write_synced(path: str, write):
+        with open(path, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    @classmethod
+    def _atomic_write(cls, path: str, write):
+        # Unique per writer: threads of one process must not share a temp file
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            cls._write_synced(tmp_path, write)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def artifact(self, record: Dict[str, Any], fmt: str = "pt") -> str:
+        """
+        Path of a version in a download format, packed on first request and
+        kept next to the version. fp16 artifacts hold half-precision
+        floating tensors (call .float() after loading); .gz artifacts are
+        gzip streams of the corresponding .pt file.
+        """
+        if fmt == "pt":
+            return record["path"]
+
+        path = f"{os.path.splitext(record['path'])[0]}{ARTIFACT_FORMATS[fmt]}"
+        if os.path.exists(path):
+            return path
+
+        with self._pack_locks_guard:
+            lock = self._pack_locks.setdefault(path, threading.Lock())
+        with lock:
+            # Another request may have packed it while we waited
+            if not os.path.exists(path):
+                self._pack(record, fmt, path)
+        return path
+
+    def _pack(self, record: Dict[str, Any], fmt: str, path: str):
+        if fmt.startswith("fp16"):
+            import torch
+
+            state_dict = torch.load(record["path"], map_location="cpu")
+            packed = {
+                k: v.half() if torch.is_tensor(v) and v.is_floating_point() else v
+                for k, v in state_dict.items()
+            }
+            write_pt = lambda f: torch.save(packed, f)
+        else:
+            def write_pt(f):
+                with open(record["path"], "rb") as src:
+                    shutil.copyfileobj(src, f)
+
+        if fmt.endswith(".gz"):
+            def write(f):
+                # No name or mtime in the header keeps the bytes (and so the ETag) reproducible
+                with gzip.GzipFile(filename="", fileobj=f, mode="wb", mtime=0) as gz:
+                    write_pt(gz)
+        else:
+            write = write_pt
+
+        self._atomic_write(path, write)
+
+    def get(self, model_name: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Catalog record of a version (latest if None), or None."""
+        with self._connect() as conn:
+            if version is None:
+                row = conn.execute(
+                    "SELECT * FROM versions WHERE model_name = ? ORDER BY version DESC LIMIT 1",
+                    (model_name,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT * FROM versions WHERE model_name = ? AND version = ?",
+                    (model_name, version)
+                ).fetchone()
+        return self._record(row) if row else None
+
+    def list_latest(self) -> List[Dict[str, Any]]:
+        """Latest version of every model."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT v.* FROM versions v "
+                "JOIN (SELECT model_name, MAX(version) AS version FROM versions GROUP BY model_name) latest "
+                "USING (model_name, version) ORDER BY v.model_name"
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def list_versions(self, model_name: str) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM versions WHERE model_name = ? ORDER BY version DESC", (model_name,)
+            ).fetchall()
+        return [self._record(row) for row in rows]
+
+    def gc(self, keep: int = KEEP_VERSIONS) -> int:
+        """Delete all but the newest `keep` versions of each model; returns how many."""
+        keep = max(1, keep)
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM versions v WHERE version <= "
+                "(SELECT MAX(version) FROM versions WHERE model_name = v.model_name) - ?",
+                (keep,)
+            ).fetchall()
+            # Unpublish first so no reader is handed a path that is about to vanish
+            conn.executemany(
+                "DELETE FROM versions WHERE model_name = ? AND version = ?",
+                [(row["model_name"], row["version"]) for row in rows]
+            )
+
+        for row in rows:
+            # Weights, file index and any packed download artifacts
+            stem = os.path.splitext(row["path"])[0]
+            for path in glob.glob(f"{glob.escape(stem)}.*"):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        return len(rows)
+
+
+@lru_cache(maxsize=1)
+def get_model_store() -> ModelStore:
+    """Process-wide store rooted at models/."""
+    return ModelStore()
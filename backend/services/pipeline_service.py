@@ -1,45 +1,178 @@
-"""
-Pipeline service for managing ML pipeline execution.
-"""
-from typing import Dict, Any, Callable
-from backend.pipeline_state import PipelineState
-from backend.pipeline_graph import test_pipeline
-import asyncio
-
-
-class PipelineService:
-    """Service for managing pipeline execution with callbacks."""
-    
-    def __init__(self):
-        self.callbacks = []
-    
-    def add_callback(self, callback: Callable[[str, Dict[str, Any]], None]):
-        """Add a callback for pipeline events."""
-        self.callbacks.append(callback)
-    
-    async def emit_event(self, event_type: str, data: Dict[str, Any]):
-        """Emit an event to all callbacks."""
-        for callback in self.callbacks:
-            await callback(event_type, data)
-    
-    async def run_pipeline(self, dataset_path: str) -> Dict[str, Any]:
-        """Run the pipeline with event callbacks."""
-        # Create initial state
-        state = PipelineState(dataset_path=dataset_path)
-        
-        # Emit start event
-        await self.emit_event("pipeline_started", {"dataset_path": dataset_path})
-        
-        try:
-            # Run pipeline (blocking operation, so use thread)
-            final_state = await asyncio.to_thread(test_pipeline.invoke, state)
-            
-            # Emit completion event
-            await self.emit_event("pipeline_completed", final_state)
-            
-            return final_state
-            
-        except Exception as e:
-            # Emit error event
-            await self.emit_event("pipeline_failed", {"error": str(e)})
-            raise
+"""
+Pipeline service for managing ML pipeline execution.
+"""
+from typing import Dict, Any, Callable, AsyncIterator, Iterator, Optional, Tuple
+from backend import metrics
+from backend.pipeline_state import PipelineState
+from backend.pipeline_graph import PIPELINE_STAGES, RESUMED_NODE, next_stage, stream_updates
+from backend import cancellation
+from backend.cancellation import PipelineCancelled
+from backend.services.pipeline_worker import PipelineWorker
+import asyncio
+import os
+import threading
+
+
+# "thread": run the graph in a thread of the API process
+# "process": run the graph in an isolated worker process (see pipeline_worker)
+EXECUTION_MODES = ("thread", "process")
+DEFAULT_EXECUTION_MODE = os.getenv("AUTOMED_EXECUTION_MODE", "thread")
+
+
+class PipelineService:
+    """Service for managing pipeline execution with callbacks."""
+
+    def __init__(self, execution_mode: str = DEFAULT_EXECUTION_MODE):
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {execution_mode}")
+
+        self.callbacks = []
+        self.execution_mode = execution_mode
+        self._cancelled = threading.Event()
+        self._worker = None
+
+    def cancel(self):
+        """
+        Cancel the running pipeline.
+        Process mode stops the worker immediately; thread mode stops after
+        the node that is currently running.
+        """
+        self._cancelled.set()
+        if self._worker is not None:
+            self._worker.cancel()
+
+    def add_callback(self, callback: Callable[[str, Dict[str, Any]], None]):
+        """Add a callback for pipeline events."""
+        self.callbacks.append(callback)
+
+    async def emit_event(self, event_type: str, data: Dict[str, Any]):
+        """Emit an event to all callbacks."""
+        for callback in self.callbacks:
+            await callback(event_type, data)
+
+    async def run_pipeline(
+        self,
+        dataset_path: Optional[str] = None,
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the pipeline with event callbacks.
+
+        Emits "pipeline_started" (or "pipeline_resumed" with the
+        checkpointed state), one "node_completed" per finished node (with
+        its state update and wall time), then "pipeline_completed",
+        "pipeline_cancelled" or "pipeline_failed".
+
+        With a run_id the state is checkpointed after every node, and
+        resume=True continues that run from its last completed stage.
+        `options` are run options (see PipelineState) added to the initial state.
+        """
+        # Create initial state
+        state = PipelineState(dataset_path=dataset_path, **(options or {}))
+        final_state: Dict[str, Any] = dict(state)
+        completed_stages = []
+
+        # Emit start event
+        if not resume:
+            await self.emit_event("pipeline_started", {"dataset_path": dataset_path})
+
+        try:
+            async for node, update in self._stream(state, run_id, resume):
+                timings = {**final_state.get("node_timings", {}), **update.get("node_timings", {})}
+                final_state.update(update)
+                final_state["node_timings"] = timings
+
+                if node == RESUMED_NODE:
+                    completed_stages = [stage for stage in PIPELINE_STAGES if stage in timings]
+                    await self.emit_event("pipeline_resumed", {
+                        "state": update,
+                        "completed_stages": list(completed_stages),
+                        "next_stage": next_stage(completed_stages),
+                    })
+                    continue
+
+                completed_stages.append(node)
+
+                await self.emit_event("node_completed", {
+                    "node": node,
+                    "update": update,
+                    "elapsed": timings.get(node),
+                    "completed_stages": list(completed_stages),
+                    "next_stage": next_stage(completed_stages),
+                })
+
+            # Emit completion event
+            metrics.inc("automed_pipeline_runs_total", status="completed")
+            await self.emit_event("pipeline_completed", final_state)
+
+            return final_state
+
+        except PipelineCancelled:
+            metrics.inc("automed_pipeline_runs_total", status="cancelled")
+            await self.emit_event("pipeline_cancelled", {"completed_stages": completed_stages})
+            raise
+
+        except Exception as e:
+            # Emit error event
+            metrics.inc("automed_pipeline_runs_total", status="failed")
+            await self.emit_event("pipeline_failed", {"error": str(e)})
+            raise
+
+    async def _stream(
+        self,
+        state: PipelineState,
+        run_id: Optional[str],
+        resume: bool
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Stream (node, update) pairs from the graph as each node finishes."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def produce():
+            # The graph is blocking, so it is driven from a worker thread
+            try:
+                for node, update in self._iter_updates(state, run_id, resume):
+                    loop.call_soon_threadsafe(events.put_nowait, ("node", node, update))
+            except Exception as e:
+                loop.call_soon_threadsafe(events.put_nowait, ("error", None, e))
+            else:
+                loop.call_soon_threadsafe(events.put_nowait, ("done", None, None))
+
+        worker = asyncio.create_task(asyncio.to_thread(produce))
+        while True:
+            kind, node, payload = await events.get()
+            if kind == "node":
+                yield node, payload or {}
+            elif kind == "error":
+                raise payload
+            else:
+                break
+        await worker
+
+    def _iter_updates(
+        self,
+        state: PipelineState,
+        run_id: Optional[str],
+        resume: bool
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Blocking iterator of (node, update) pairs for the configured mode."""
+        if self.execution_mode == "process":
+            self._worker = PipelineWorker(state, run_id=run_id, resume=resume)
+            if self._cancelled.is_set():
+                raise PipelineCancelled("Pipeline run was cancelled")
+            self._worker.start()
+            yield from self._worker.iter_updates()
+            return
+
+        # The trainer checks the event between epochs; other nodes are short
+        cancellation.register(run_id, self._cancelled)
+        try:
+            for node, update in stream_updates(state, run_id, resume):
+                yield node, update
+                # Once the trainer has published its model the run is complete
+                if self._cancelled.is_set() and node != PIPELINE_STAGES[-1]:
+                    raise PipelineCancelled("Pipeline run was cancelled")
+        finally:
+            cancellation.unregister(run_id)
@@ -0,0 +1,213 @@
+"""
+Process-isolated pipeline execution.
+
+Runs the LangGraph pipeline in a separate worker process so training does
+not compete with the API for the GIL and a runaway run cannot take the API
+down with it. Node updates, agent logs and metrics are streamed back over a queue.
+"""
+import glob
+import multiprocessing as mp
+import os
+import queue
+import signal
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from backend import logger
+from backend.cancellation import PipelineCancelled
+
+
+# Resource limits (0 = unlimited / library default)
+DEFAULT_MAX_RSS_MB = int(os.getenv("AUTOMED_WORKER_MAX_RSS_MB", "0"))
+DEFAULT_NUM_THREADS = int(os.getenv("AUTOMED_WORKER_THREADS", "0"))
+
+# Thread pools that must be capped before torch / numpy initialise
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+class _LogForwarder:
+    """Queue-like sink that tags send_log entries for the parent process."""
+
+    def __init__(self, events):
+        self.events = events
+
+    def put(self, entry):
+        self.events.put(("log", None, entry))
+
+
+def _worker_main(
+    state: Dict[str, Any],
+    run_id: Optional[str],
+    resume: bool,
+    events,
+    num_threads: int
+):
+    """Entry point of the worker process."""
+    if num_threads:
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = str(num_threads)
+        # Training subprocesses (DDP ranks, sweep pool) split this budget between them
+        os.environ["AUTOMED_WORKER_THREADS"] = str(num_threads)
+
+    logger.redirect_logs(_LogForwarder(events))
+
+    try:
+        if num_threads:
+            import torch
+            torch.set_num_threads(num_threads)
+
+        from backend.pipeline_graph import stream_updates
+
+        for node, update in stream_updates(state, run_id, resume):
+            events.put(("node", node, update))
+    except Exception as e:
+        events.put(("error", None, str(e)))
+    else:
+        events.put(("done", None, None))
+
+
+def _read_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB, or None if unavailable."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _process_tree(pid: int) -> List[int]:
+    """`pid` and all of its descendants (DDP ranks, sweep pool workers, ...)."""
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        for children_file in glob.glob(f"/proc/{current}/task/*/children"):
+            try:
+                with open(children_file) as f:
+                    pending.extend(int(child) for child in f.read().split())
+            except (OSError, ValueError):
+                continue
+    return pids
+
+
+def _read_tree_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process and its descendants in MB, or None if unavailable."""
+    rss = _read_rss_mb(pid)
+    if rss is None:
+        return None
+    for child in _process_tree(pid)[1:]:
+        rss += _read_rss_mb(child) or 0.0
+    return rss
+
+
+class PipelineWorker:
+    """A pipeline run executing in its own process."""
+
+    def __init__(
+        self,
+        state: Dict[str, Any],
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        max_rss_mb: int = DEFAULT_MAX_RSS_MB,
+        num_threads: int = DEFAULT_NUM_THREADS,
+        poll_interval: float = 0.5
+    ):
+        # "spawn" gives the worker a clean interpreter (no inherited threads/locks)
+        ctx = mp.get_context("spawn")
+        self.events = ctx.Queue()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(dict(state), run_id, resume, self.events, num_threads),
+            name="automed-pipeline-worker"
+        )
+        self.max_rss_mb = max_rss_mb
+        self.poll_interval = poll_interval
+        self.cancelled = False
+        # cancel() (request handler) and iter_updates() (pipeline thread) may both terminate
+        self._terminate_lock = threading.Lock()
+
+    def start(self):
+        self.process.start()
+
+    def iter_updates(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Yield (node, update) pairs as the worker finishes nodes.
+        Logs and metrics are forwarded to this process. Blocking.
+        """
+        last_check = time.monotonic()
+        try:
+            while True:
+                # Checked on a timer so a chatty worker cannot starve the watchdog
+                if time.monotonic() - last_check >= self.poll_interval:
+                    self._check_health(idle=False)
+                    last_check = time.monotonic()
+
+                try:
+                    kind, node, payload = self.events.get(timeout=self.poll_interval)
+                except queue.Empty:
+                    self._check_health(idle=True)
+                    last_check = time.monotonic()
+                    continue
+
+                if kind == "log":
+                    logger.dispatch(payload)
+                elif kind == "node":
+                    yield node, payload
+                elif kind == "error":
+                    raise RuntimeError(payload)
+                else:
+                    self.process.join(timeout=5)
+                    return
+        finally:
+            self.terminate()
+            # Release the queue's feeder thread so the parent does not leak it
+            self.events.close()
+            self.events.cancel_join_thread()
+
+    def _check_health(self, idle: bool):
+        if self.cancelled:
+            raise PipelineCancelled("Pipeline run was cancelled")
+
+        # A clean exit may still have its final events in flight; only an
+        # empty queue proves they were lost
+        if not self.process.is_alive() and (idle or self.process.exitcode != 0):
+            raise RuntimeError(f"Pipeline worker exited unexpectedly (exit code {self.process.exitcode})")
+
+        if self.max_rss_mb:
+            # Training subprocesses count against the worker's limit
+            rss = _read_tree_rss_mb(self.process.pid)
+            if rss is not None and rss > self.max_rss_mb:
+                raise MemoryError(
+                    f"Pipeline worker and its subprocesses exceeded memory limit ({rss:.0f} MB > {self.max_rss_mb} MB)"
+                )
+
+    def cancel(self):
+        """Stop the worker; iter_updates() raises PipelineCancelled."""
+        self.cancelled = True
+        self.terminate()
+
+    def terminate(self, grace_period: float = 5.0):
+        """Stop the worker process (SIGTERM, then SIGKILL after a grace period). Thread-safe."""
+        with self._terminate_lock:
+            self._terminate(grace_period)
+
+    def _terminate(self, grace_period: float):
+        if self.process.pid is None:
+            return
+        children = []
+        if self.process.is_alive():
+            children = _process_tree(self.process.pid)[1:]
+            self.process.terminate()
+            self.process.join(grace_period)
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join(timeout=1)
+
+        # DDP ranks / sweep workers of a killed worker would otherwise be orphaned
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
@@ -0,0 +1,259 @@
+"""
+Zip / tar archives as dataset sources, read in place (no extraction).
+
+An archive holds the usual layout under an optional top-level folder:
+[root/]train/<class>/<image> and [root/]test/<class>/<image>. It is
+indexed once (member names, sizes, mtimes and, for uncompressed tar,
+data offsets) and the index is cached on disk, keyed on the archive's
+path, size and mtime. Image bytes are then read directly:
+
+- zip and uncompressed tar: random access (zip central directory, tar
+  data offsets), so any member can be read with one seek
+- compressed tar (.tar.gz, .tar.bz2, .tar.xz): sequential only; see
+  iter_archive_images()
+
+A dataset can also be a shard directory (WebDataset-style): a folder of
+archives, each holding part of the layout, e.g. shard-000.tar.gz ...
+shard-127.tar.gz. Streaming consumers then read disjoint sets of shards.
+
+Members are addressed by their dataset-relative path ("train/cls/a.png",
+or "shard-000.tar.gz/train/cls/a.png" in a shard directory), and samples
+by the virtual path <archive>/<member path>, so code that computes
+os.path.relpath(sample, dataset_path) works unchanged.
+"""
+import hashlib
+import json
+import os
+import tarfile
+import uuid
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+
+ARCHIVE_CACHE_DIR = os.getenv("AUTOMED_ARCHIVE_CACHE_DIR", os.path.join(".cache", "archives"))
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+SPLITS = ("train", "test")
+
+# Magic numbers of the tar compressions tarfile understands
+COMPRESSION_MAGIC = (b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00")
+
+# Index entry fields: [relative path, member name, size, mtime (ns), data offset or None]
+REL, NAME, SIZE, MTIME, OFFSET = range(5)
+
+# Bumped when the index format changes, so cached indexes are rebuilt
+INDEX_VERSION = 2
+
+# Archive kinds remembered per (path, size, mtime)
+KIND_CACHE_SIZE = 4096
+
+
+def archive_kind(path):
+    """"zip", "tar" (uncompressed), "tar-stream" (compressed tar) or None."""
+    if not os.path.isfile(path):
+        return None
+    # Probing reads (and for tar, decompresses) the file: do it once per file version
+    st = os.stat(path)
+    return _probe_kind(os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+@lru_cache(maxsize=KIND_CACHE_SIZE)
+def _probe_kind(path, size, mtime_ns):
+    if zipfile.is_zipfile(path):
+        return "zip"
+    if not tarfile.is_tarfile(path):
+        return None
+
+    with open(path, "rb") as f:
+        head = f.read(6)
+    return "tar-stream" if head.startswith(COMPRESSION_MAGIC) else "tar"
+
+
+def is_archive(path):
+    return archive_kind(path) is not None
+
+
+def shard_archives(path):
+    """
+    Sorted archives of a shard directory (a folder without train/ or test/
+    whose files are all archives), or None if `path` is not one.
+    """
+    if not os.path.isdir(path) or any(os.path.isdir(os.path.join(path, split)) for split in SPLITS):
+        return None
+    files = sorted(os.path.join(path, f) for f in os.listdir(path) if not f.startswith("."))
+    if not files or not all(is_archive(f) for f in files):
+        return None
+    return files
+
+
+def dataset_archives(path):
+    """
+    [(archive path, member prefix)] of an archive dataset: a single archive
+    (prefix ""), the shards of a shard directory (prefix "<shard name>/"),
+    or [] for an extracted folder.
+    """
+    if is_archive(path):
+        return [(path, "")]
+    return [(shard, f"{os.path.basename(shard)}/") for shard in shard_archives(path) or []]
+
+
+def is_archive_dataset(path):
+    return bool(dataset_archives(path))
+
+
+def relative_member(name):
+    """'root/train/cls/a.png' -> 'train/cls/a.png'; None for anything that is not a dataset image."""
+    parts = name.replace("\\", "/").strip("/").split("/")
+    if len(parts) < 3 or parts[-3] not in SPLITS:
+        return None
+    if "__MACOSX" in parts or parts[-1].startswith("."):
+        return None
+    if not parts[-1].lower().endswith(IMAGE_EXTENSIONS):
+        return None
+    return "/".join(parts[-3:])
+
+
+def _index_cache_path(path):
+    st = os.stat(path)
+    key = hashlib.sha256(f"{INDEX_VERSION}|{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}".encode()).hexdigest()
+    return os.path.join(ARCHIVE_CACHE_DIR, f"{key}.json")
+
+
+def index_archive(path):
+    """
+    Return {"kind", "members"} with one entry per dataset image, in
+    archive order (see REL .. OFFSET). Built once per archive version.
+    """
+    cache_path = _index_cache_path(path)
+    if os.path.exists(cache_path):
+        with open(cache_path, "r") as f:
+            return json.load(f)
+
+    kind = archive_kind(path)
+    members = []
+    if kind == "zip":
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                rel = relative_member(info.filename)
+                if rel and not info.is_dir():
+                    mtime = int(datetime(*info.date_time).timestamp()) * 1_000_000_000
+                    members.append([rel, info.filename, info.file_size, mtime, None])
+    elif kind == "tar":
+        # Uncompressed: reading the headers seeks over the data, and offsets allow random access later
+        with tarfile.open(path, "r:") as tar:
+            for member in tar:
+                rel = relative_member(member.name)
+                if rel and member.isfile():
+                    members.append([rel, member.name, member.size, _mtime_ns(member), member.offset_data])
+    elif kind == "tar-stream":
+        # Compressed: one full decompression pass; members can only be read sequentially
+        with tarfile.open(path, "r|*") as tar:
+            for member in tar:
+                rel = relative_member(member.name)
+                if rel and member.isfile():
+                    members.append([rel, member.name, member.size, _mtime_ns(member), None])
+    else:
+        raise ValueError(f"Not a zip or tar archive: {path}")
+
+    index = {"kind": kind, "members": members}
+
+    os.makedirs(ARCHIVE_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cache_path}.{uuid.uuid4().hex}.tmp"  # unique per writer, including threads
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    os.replace(tmp_path, cache_path)
+
+    return index
+
+
+def _mtime_ns(member):
+    """Tar member mtime in ns, the unit of st_mtime_ns in folder file indexes."""
+    return int(round(member.mtime * 1_000_000_000))
+
+
+def scan_archive(path):
+    """
+    Archive (or shard directory) counterpart of data_inspector.scan_dataset():
+    [(split, class, virtual path)].
+    """
+    entries = []
+    for archive, _ in dataset_archives(path):
+        for member in index_archive(archive)["members"]:
+            split, cls, _ = member[REL].split("/")
+            entries.append((split, cls, os.path.join(archive, member[REL])))
+    return entries
+
+
+def archive_file_index(path):
+    """{dataset-relative path: [size, mtime_ns]} signatures, like data_inspector.build_file_index()."""
+    return {
+        prefix + m[REL]: [m[SIZE], m[MTIME]]
+        for archive, prefix in dataset_archives(path)
+        for m in index_archive(archive)["members"]
+    }
+
+
+def iter_archive_images(path, wanted=None):
+    """
+    Yield (dataset-relative path, bytes) for the images of an archive or
+    shard directory in archive order, reading each archive front to back.
+    `wanted` (a set of dataset-relative paths) limits which members are
+    read; others are skipped without reading, as are shards with none.
+    """
+    for archive, prefix in dataset_archives(path):
+        archive_wanted = None
+        if wanted is not None:
+            archive_wanted = {rel[len(prefix):] for rel in wanted if rel.startswith(prefix)}
+            if not archive_wanted:
+                continue
+        for rel, data in _iter_members(archive, archive_wanted):
+            yield prefix + rel, data
+
+
+def _iter_members(path, wanted=None):
+    """(member relative path, bytes) of one archive, read sequentially."""
+    if archive_kind(path) == "zip":
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                rel = relative_member(info.filename)
+                if rel and not info.is_dir() and (wanted is None or rel in wanted):
+                    yield rel, zf.read(info)
+        return
+
+    with tarfile.open(path, "r|*") as tar:
+        for member in tar:
+            rel = relative_member(member.name)
+            if rel and member.isfile() and (wanted is None or rel in wanted):
+                yield rel, tar.extractfile(member).read()
+
+
+class ArchiveReader:
+    """
+    Random-access member reads from a zip or uncompressed tar. The file
+    handle is opened lazily per process, so readers can be pickled into
+    DataLoader workers and spawned DDP ranks.
+    """
+
+    def __init__(self, path, kind):
+        if kind not in ("zip", "tar"):
+            raise ValueError(f"{kind} archives can only be read sequentially")
+        self.path = path
+        self.kind = kind
+        self._handle = None
+        self._pid = None
+
+    def __getstate__(self):
+        return {"path": self.path, "kind": self.kind, "_handle": None, "_pid": None}
+
+    def _open(self):
+        if self._handle is None or self._pid != os.getpid():
+            self._handle = zipfile.ZipFile(self.path) if self.kind == "zip" else open(self.path, "rb")
+            self._pid = os.getpid()
+        return self._handle
+
+    def read(self, member):
+        handle = self._open()
+        if self.kind == "zip":
+            return handle.read(member[NAME])
+        handle.seek(member[OFFSET])
+        return handle.read(member[SIZE])
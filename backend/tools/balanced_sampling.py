@@ -0,0 +1,95 @@
+"""
+Class-imbalance handling for the trainer: a class-balanced epoch
+sampler, class weights for the loss, and per-class metrics.
+
+Enabled from dataset_stats["imbalance_ratio"] (see balancing_enabled).
+"""
+import os
+
+import torch
+from torch.utils.data import Sampler
+from sklearn.metrics import precision_recall_fscore_support
+
+# Same threshold the planner prompts use for "imbalanced"
+IMBALANCE_THRESHOLD = 3.0
+
+# "auto" = balance when imbalance_ratio > IMBALANCE_THRESHOLD; "1" / "0" force on / off
+BALANCED_SAMPLING = os.getenv("AUTOMED_BALANCED_SAMPLING", "auto")
+CLASS_WEIGHTED_LOSS = os.getenv("AUTOMED_CLASS_WEIGHTED_LOSS", "0") == "1"
+
+
+def balancing_enabled(stats, option=None):
+    """Resolve a run's balanced-sampling option (None / "auto" / bool)."""
+    option = BALANCED_SAMPLING if option is None else option
+    if option == "auto":
+        return stats.get("imbalance_ratio", 1) > IMBALANCE_THRESHOLD
+    return option in (True, "1", "true")
+
+
+def subset_targets(dataset, indices=None):
+    """Class index of every sample of an ImageFolder (or of a subset of it)."""
+    if indices is None:
+        return list(dataset.targets)
+    return [dataset.targets[i] for i in indices]
+
+
+def class_counts(targets, num_classes):
+    """Samples per class, in one pass over the targets."""
+    counts = torch.bincount(torch.as_tensor(targets, dtype=torch.long), minlength=num_classes)
+    return counts.tolist()
+
+
+def class_weights(targets, num_classes):
+    """Inverse-frequency weights n / (k * count_c) for CrossEntropyLoss."""
+    counts = torch.tensor(class_counts(targets, num_classes), dtype=torch.float)
+    weights = len(targets) / (num_classes * counts.clamp(min=1))
+    weights[counts == 0] = 0.0
+    return weights
+
+
+class BalancedEpochSampler(Sampler):
+    """
+    Draws a class-balanced index list each epoch: every class is sampled
+    with equal probability (with replacement). Per-sample weights are
+    built once in O(n); with num_replicas > 1 each rank takes an
+    interleaved shard of the same epoch draw, like DistributedSampler.
+    """
+
+    def __init__(self, targets, num_classes, num_replicas=1, rank=0, seed=0):
+        targets = torch.as_tensor(targets, dtype=torch.long)
+        counts = torch.bincount(targets, minlength=num_classes).float()
+        self.weights = (1.0 / counts.clamp(min=1))[targets]
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self.epoch = 0
+        self.num_samples = -(-len(targets) // num_replicas)  # ceil
+        self.total_size = self.num_samples * num_replicas
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def __iter__(self):
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        indices = torch.multinomial(self.weights, self.total_size, replacement=True, generator=generator)
+        return iter(indices[self.rank:self.total_size:self.num_replicas].tolist())
+
+    def __len__(self):
+        return self.num_samples
+
+
+def per_class_metrics(labels, preds, class_names):
+    """{class_name: {"precision", "recall", "f1", "support"}}."""
+    precision, recall, f1, support = precision_recall_fscore_support(
+        labels, preds, labels=list(range(len(class_names))), zero_division=0
+    )
+    return {
+        name: {
+            "precision": float(precision[i]),
+            "recall": float(recall[i]),
+            "f1": float(f1[i]),
+            "support": int(support[i])
+        }
+        for i, name in enumerate(class_names)
+    }
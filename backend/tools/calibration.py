@@ -0,0 +1,136 @@
+"""
+Test-time augmentation (TTA) and temperature scaling.
+
+TTA runs a few deterministic views of an image (horizontal flip and
+small rotations, following the training aug_plan) as one batch and
+averages their logits. Temperature scaling divides logits by a scalar T
+fitted on the test split after training by minimising the NLL; it
+calibrates the softmax without changing the predicted class.
+"""
+import os
+
+import torch
+import torch.nn.functional as F
+import torchvision.transforms as T
+import torchvision.transforms.functional as TF
+from torch.utils.data import DataLoader
+
+from backend.tools.image_datasets import has_split, open_split
+
+# Fit temperatures after training (needs a test split)
+CALIBRATION_ENABLED = os.getenv("AUTOMED_CALIBRATION", "1") == "1"
+
+# TTA views for models trained without a recorded aug_plan
+DEFAULT_TTA_AUG = {"rotation": 10, "flip": True}
+
+# TTA rotations stay small even when training used larger ones
+MAX_TTA_ROTATION = 15
+
+EVAL_BATCH_SIZE = 32
+
+
+def tta_config(aug):
+    """The parts of an aug_plan that TTA follows."""
+    aug = aug or DEFAULT_TTA_AUG
+    return {
+        "rotation": min(float(aug.get("rotation", 0) or 0), MAX_TTA_ROTATION),
+        "flip": bool(aug.get("flip"))
+    }
+
+
+def tta_views(images, aug=None):
+    """
+    N x C x H x W images -> V x N x C x H x W views: the original, its
+    horizontal flip (if the plan flips) and +/- the plan's rotation.
+    """
+    config = tta_config(aug)
+    views = [images]
+    if config["flip"]:
+        views.append(TF.hflip(images))
+    if config["rotation"] > 0:
+        views.append(TF.rotate(images, config["rotation"]))
+        views.append(TF.rotate(images, -config["rotation"]))
+    return torch.stack(views)
+
+
+def tta_logits(model, images, aug=None):
+    """
+    Plain and TTA-averaged logits of a batch from a single forward pass
+    over every view. Returns (plain N x K, averaged N x K).
+    """
+    views = tta_views(images, aug)
+    num_views, n = views.shape[:2]
+    logits = model(views.flatten(0, 1)).view(num_views, n, -1)
+    return logits[0], logits.mean(dim=0)
+
+
+def fit_temperature(logits, labels):
+    """Temperature minimising the NLL of softmax(logits / T) on the labels."""
+    log_t = torch.zeros(1, requires_grad=True)
+    optimizer = torch.optim.LBFGS([log_t], lr=0.1, max_iter=100)
+
+    def closure():
+        optimizer.zero_grad()
+        loss = F.cross_entropy(logits / log_t.exp(), labels)
+        loss.backward()
+        return loss
+
+    optimizer.step(closure)
+    return float(log_t.detach().exp().clamp(0.05, 20.0))
+
+
+def test_split_logits(model, dataset_path, classes, aug=None, tta=True):
+    """
+    Logits of the trained model on the test split: (plain, TTA-averaged
+    or None without `tta`, labels). None if there is no test split with
+    the same classes.
+    """
+    if not has_split(dataset_path, "test"):
+        return None
+
+    dataset = open_split(dataset_path, "test", T.Compose([T.Resize((224, 224)), T.ToTensor()]))
+    if dataset.classes != classes or len(dataset) == 0:
+        return None
+
+    device = next(model.parameters()).device
+    model.eval()
+    plain, averaged, labels = [], [], []
+    with torch.no_grad():
+        for imgs, targets in DataLoader(dataset, batch_size=EVAL_BATCH_SIZE):
+            if tta:
+                batch_plain, batch_averaged = tta_logits(model, imgs.to(device), aug)
+                averaged.append(batch_averaged.cpu())
+            else:
+                batch_plain = model(imgs.to(device))
+            plain.append(batch_plain.cpu())
+            labels.append(targets)
+
+    return torch.cat(plain), torch.cat(averaged) if tta else None, torch.cat(labels)
+
+
+def calibrate(plain, averaged, labels, aug=None):
+    """
+    Fit temperatures for plain and TTA inference from test-split logits
+    (see test_split_logits). Returns the calibration metadata stored with
+    the model.
+    """
+    temperature = fit_temperature(plain, labels)
+    tta_temperature = fit_temperature(averaged, labels)
+
+    return {
+        "temperature": temperature,
+        "tta_temperature": tta_temperature,
+        "tta": tta_config(aug),
+        "samples": len(labels),
+        "nll": float(F.cross_entropy(plain, labels)),
+        "calibrated_nll": float(F.cross_entropy(plain / temperature, labels)),
+        "tta_calibrated_nll": float(F.cross_entropy(averaged / tta_temperature, labels))
+    }
+
+
+def calibrated_probabilities(logits, calibration=None, tta=False):
+    """Softmax of logits / T, with T from the model's calibration metadata (1 if none)."""
+    temperature = 1.0
+    if calibration:
+        temperature = calibration["tta_temperature" if tta else "temperature"]
+    return F.softmax(logits / temperature, dim=-1)
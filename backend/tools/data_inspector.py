@@ -1,80 +1,145 @@
-import os
-import cv2
-import numpy as np
-
-
-def compute_blur(image_path):
-    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-    if img is None:
-        return None
-    return cv2.Laplacian(img, cv2.CV_64F).var()
-
-
-def compute_noise(image_path):
-    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
-    if img is None:
-        return None
-    return np.std(img)
-
-
-def analyze_dataset(dataset_path):
-    """
-    Handles dataset structured like:
-    dataset/
-        train/
-            0/
-            1/
-        test/
-            0/
-            1/
-    OR any number of classes.
-    """
-
-    image_paths = []
-    class_counts = {}
-
-    # Loop over train and test folders
-    for split in ["train", "test"]:
-        split_path = os.path.join(dataset_path, split)
-        if not os.path.exists(split_path):
-            continue
-
-        # Loop over class folders
-        for cls in os.listdir(split_path):
-            class_dir = os.path.join(split_path, cls)
-            if not os.path.isdir(class_dir):
-                continue
-
-            # Count images in this class folder
-            num_imgs = len([f for f in os.listdir(class_dir)
-                            if f.lower().endswith((".jpg", ".jpeg", ".png"))])
-
-            # Add to class count (sum train + test)
-            class_counts[cls] = class_counts.get(cls, 0) + num_imgs
-
-            # Add full image paths for blur/noise calc
-            for img_file in os.listdir(class_dir):
-                if img_file.lower().endswith((".jpg", ".jpeg", ".png")):
-                    image_paths.append(os.path.join(class_dir, img_file))
-
-    # Calculate blur + noise scores
-    blur_scores = [compute_blur(p) for p in image_paths]
-    noise_scores = [compute_noise(p) for p in image_paths]
-
-    # Avoid errors for empty datasets
-    valid_blur = [x for x in blur_scores if x is not None]
-    valid_noise = [x for x in noise_scores if x is not None]
-
-    stats = {
-        "size": len(image_paths),
-        "class_dist": class_counts,
-        "imbalance_ratio": (
-            max(class_counts.values()) / min(class_counts.values())
-            if len(class_counts) > 1 else 1
-        ),
-        "avg_blur": float(np.mean(valid_blur)) if valid_blur else 0.0,
-        "avg_noise": float(np.mean(valid_noise)) if valid_noise else 0.0,
-        "num_classes": len(class_counts)
-    }
-
-    return stats
+import os
+import time
+import cv2
+import numpy as np
+from backend import metrics
+from backend.tools.archive_source import archive_file_index, is_archive_dataset, iter_archive_images, scan_archive
+
+
+def compute_blur(image_path):
+    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return None
+    return cv2.Laplacian(img, cv2.CV_64F).var()
+
+
+def compute_noise(image_path):
+    img = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return None
+    return np.std(img)
+
+
+def archive_quality_scores(dataset_path, entries):
+    """
+    Blur and noise scores of archive images, decoding each image once
+    in a single front-to-back pass over the archive.
+    """
+    wanted = {os.path.relpath(path, dataset_path).replace(os.sep, "/") for _, _, path in entries}
+    blur_scores, noise_scores = [], []
+    for _, data in iter_archive_images(dataset_path, wanted):
+        img = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+        if img is None:
+            continue
+        blur_scores.append(cv2.Laplacian(img, cv2.CV_64F).var())
+        noise_scores.append(np.std(img))
+    return blur_scores, noise_scores
+
+
+def scan_dataset(dataset_path):
+    """
+    List the images of a dataset structured like:
+    dataset/
+        train/
+            0/
+            1/
+        test/
+            0/
+            1/
+    OR any number of classes.
+
+    OR a zip / tar archive with that layout, or a directory of such
+    archive shards (image_path is then <archive>/<split>/<class>/<image>,
+    see archive_source).
+
+    Returns a list of (split, class_name, image_path).
+    """
+    if is_archive_dataset(dataset_path):
+        return scan_archive(dataset_path)
+
+    entries = []
+
+    # Loop over train and test folders
+    for split in ["train", "test"]:
+        split_path = os.path.join(dataset_path, split)
+        if not os.path.exists(split_path):
+            continue
+
+        # Loop over class folders
+        for cls in os.listdir(split_path):
+            class_dir = os.path.join(split_path, cls)
+            if not os.path.isdir(class_dir):
+                continue
+
+            for img_file in os.listdir(class_dir):
+                if img_file.lower().endswith((".jpg", ".jpeg", ".png")):
+                    entries.append((split, cls, os.path.join(class_dir, img_file)))
+
+    return entries
+
+
+def build_file_index(dataset_path, entries=None):
+    """
+    Map each image's dataset-relative path ("train/cls/img.jpg") to its
+    [size, mtime_ns] signature, used to detect new or changed images.
+    """
+    if entries is None:
+        entries = scan_dataset(dataset_path)
+
+    if is_archive_dataset(dataset_path):
+        signatures = archive_file_index(dataset_path)
+        return {rel: signatures[rel] for rel in (
+            os.path.relpath(path, dataset_path).replace(os.sep, "/") for _, _, path in entries
+        )}
+
+    index = {}
+    for _, _, path in entries:
+        st = os.stat(path)
+        rel_path = os.path.relpath(path, dataset_path).replace(os.sep, "/")
+        index[rel_path] = [st.st_size, st.st_mtime_ns]
+
+    return index
+
+
+def analyze_dataset(dataset_path, entries=None):
+    """
+    Compute size, class distribution, imbalance, blur and noise stats.
+    See scan_dataset() for the expected layout.
+    """
+    if entries is None:
+        entries = scan_dataset(dataset_path)
+
+    image_paths = [path for _, _, path in entries]
+    class_counts = {}
+
+    # Class counts sum train + test
+    for _, cls, _ in entries:
+        class_counts[cls] = class_counts.get(cls, 0) + 1
+
+    # Calculate blur + noise scores
+    start = time.perf_counter()
+    if is_archive_dataset(dataset_path):
+        blur_scores, noise_scores = archive_quality_scores(dataset_path, entries)
+    else:
+        blur_scores = [compute_blur(p) for p in image_paths]
+        noise_scores = [compute_noise(p) for p in image_paths]
+    metrics.inc("automed_images_decoded_total", len(image_paths), stage="inspector")
+    metrics.inc("automed_decode_seconds_total", time.perf_counter() - start, stage="inspector")
+
+    # Avoid errors for empty datasets
+    valid_blur = [x for x in blur_scores if x is not None]
+    valid_noise = [x for x in noise_scores if x is not None]
+
+    stats = {
+        "size": len(image_paths),
+        "class_dist": class_counts,
+        "imbalance_ratio": (
+            max(class_counts.values()) / min(class_counts.values())
+            if len(class_counts) > 1 else 1
+        ),
+        "avg_blur": float(np.mean(valid_blur)) if valid_blur else 0.0,
+        "avg_noise": float(np.mean(valid_noise)) if valid_noise else 0.0,
+        "num_classes": len(class_counts)
+    }
+
+    return stats
@@ -0,0 +1,252 @@
+"""
+Data-parallel multi-process CPU training with DistributedDataParallel.
+
+Ranks run on localhost and synchronise gradients with the gloo backend.
+Each rank trains on its DistributedSampler shard; rank 0 writes epoch
+checkpoints and the final weights, and metrics are aggregated across
+all ranks.
+"""
+import os
+import queue
+import socket
+import time
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+import torch.nn as nn
+import torch.optim as optim
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import DataLoader, Subset
+from torch.utils.data.distributed import DistributedSampler
+
+from backend import cancellation, logger
+from backend.tools.balanced_sampling import BalancedEpochSampler, class_weights, subset_targets
+from backend.tools.image_datasets import is_streaming, open_split
+from backend.tools.training import (
+    BATCH_SIZE,
+    LEARNING_RATE,
+    NUM_EPOCHS,
+    build_model,
+    build_transform,
+    cpu_budget,
+    load_trainer_checkpoint,
+    save_trainer_checkpoint,
+    train_one_epoch,
+)
+
+
+class _RankLogForwarder:
+    """Queue-like sink that forwards rank-0 send_log (and metric) entries to the parent."""
+
+    def __init__(self, events):
+        self.events = events
+
+    def put(self, entry):
+        self.events.put(("log", entry))
+
+
+class _NullLogSink:
+    """Discards send_log entries (ranks other than 0 stay quiet)."""
+
+    def put(self, entry):
+        pass
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _gather_lists(values, world_size):
+    """Concatenate a per-rank Python list across all ranks."""
+    gathered = [None] * world_size
+    dist.all_gather_object(gathered, values)
+    return [v for rank_values in gathered for v in rank_values]
+
+
+def _rank_main(rank, world_size, port, config, events):
+    """Entry point of one training rank."""
+    torch.set_num_threads(config["threads_per_rank"])
+    if rank == 0:
+        logger.redirect_logs(_RankLogForwarder(events))
+    else:
+        logger.redirect_logs(_NullLogSink())
+
+    os.environ["MASTER_ADDR"] = "127.0.0.1"
+    os.environ["MASTER_PORT"] = str(port)
+    dist.init_process_group("gloo", rank=rank, world_size=world_size)
+
+    try:
+        image_folder = open_split(config["dataset_path"], "train", build_transform(config["aug"]))
+        targets = subset_targets(image_folder, config["train_indices"])
+
+        if is_streaming(image_folder):
+            # Compressed tar: every rank reads the stream and keeps its round-robin share
+            dataset = sampler = image_folder.subset(config["train_indices"], rank=rank, world_size=world_size)
+            loader = DataLoader(dataset, batch_size=config["batch_size"])
+        else:
+            dataset = image_folder
+            if config["train_indices"] is not None:
+                dataset = Subset(image_folder, config["train_indices"])
+
+            if config["balanced"]:
+                sampler = BalancedEpochSampler(targets, config["num_classes"], num_replicas=world_size, rank=rank)
+            else:
+                sampler = DistributedSampler(dataset, num_replicas=world_size, rank=rank, shuffle=True)
+            loader = DataLoader(dataset, batch_size=config["batch_size"], sampler=sampler)
+
+        # Only rank 0 needs the ImageNet weights: DDP broadcasts its parameters
+        pretrained = config["init_weights_path"] is None and rank == 0
+        model = build_model(config["selected"], config["num_classes"], pretrained=pretrained)
+        if config["init_weights_path"] is not None:
+            model.load_state_dict(torch.load(config["init_weights_path"], map_location="cpu"))
+
+        model = DistributedDataParallel(model)
+        weight = class_weights(targets, config["num_classes"]) if config["weighted_loss"] else None
+        criterion = nn.CrossEntropyLoss(weight=weight)
+        optimizer = optim.Adam(model.parameters(), lr=config["lr"])
+
+        all_preds, all_labels = [], []
+        epoch_stats = []
+        start_epoch = 0
+
+        checkpoint = load_trainer_checkpoint(
+            config["checkpoint_path"], config["selected"], config["classes"], config["mode"]
+        )
+        if checkpoint is not None:
+            model.module.load_state_dict(checkpoint["model"])
+            optimizer.load_state_dict(checkpoint["optimizer"])
+            all_preds, all_labels = checkpoint["all_preds"], checkpoint["all_labels"]
+            start_epoch = checkpoint["epoch"] + 1
+            logger.send_log("trainer", f"Resuming from checkpoint after epoch {start_epoch}/{config['num_epochs']}")
+
+        for epoch in range(start_epoch, config["num_epochs"]):
+            logger.send_log("trainer", f"Epoch {epoch + 1}/{config['num_epochs']} ({world_size} processes)")
+            sampler.set_epoch(epoch)
+
+            epoch_start = time.perf_counter()
+            preds, labels = train_one_epoch(model, loader, criterion, optimizer, "cpu")
+            epoch_seconds = time.perf_counter() - epoch_start
+            all_preds.extend(_gather_lists(preds, world_size))
+            all_labels.extend(_gather_lists(labels, world_size))
+
+            # Training time only (no spawn / import / model setup): the slowest rank bounds the epoch
+            rank_stats = _gather_lists([(epoch_seconds, len(labels))], world_size)
+            epoch_stats.append({
+                "seconds": max(seconds for seconds, _ in rank_stats),
+                "images": sum(images for _, images in rank_stats)
+            })
+
+            if rank == 0 and config["checkpoint_path"]:
+                save_trainer_checkpoint(config["checkpoint_path"], {
+                    "epoch": epoch,
+                    "selected": config["selected"],
+                    "classes": config["classes"],
+                    "mode": config["mode"],
+                    "train_indices": config["train_indices"],
+                    "model": model.module.state_dict(),
+                    "optimizer": optimizer.state_dict(),
+                    "all_preds": all_preds,
+                    "all_labels": all_labels
+                })
+            dist.barrier()
+
+        if rank == 0:
+            torch.save(model.module.state_dict(), config["result_path"])
+            events.put(("result", {"all_preds": all_preds, "all_labels": all_labels, "epochs": epoch_stats}))
+    finally:
+        dist.destroy_process_group()
+
+
+def train_distributed(
+    dataset_path,
+    aug,
+    selected,
+    num_classes,
+    classes,
+    result_path,
+    world_size,
+    mode="full",
+    train_indices=None,
+    init_weights_path=None,
+    checkpoint_path=None,
+    num_epochs=NUM_EPOCHS,
+    lr=LEARNING_RATE,
+    batch_size=BATCH_SIZE,
+    threads_per_rank=None,
+    balanced=False,
+    weighted_loss=False,
+    run_id=None
+):
+    """
+    Train with `world_size` gloo ranks on localhost. Blocks until done,
+    or raises PipelineCancelled (stopping the ranks) if `run_id` is cancelled.
+
+    The final weights are written to `result_path`; returns the aggregated
+    {"all_preds", "all_labels"} from every rank and per-epoch
+    {"seconds", "images"} training times ("epochs").
+    """
+    if threads_per_rank is None:
+        threads_per_rank = max(1, cpu_budget() // world_size)
+
+    config = {
+        "dataset_path": dataset_path,
+        "aug": aug,
+        "selected": selected,
+        "num_classes": num_classes,
+        "classes": classes,
+        "mode": mode,
+        "train_indices": train_indices,
+        "init_weights_path": init_weights_path,
+        "checkpoint_path": checkpoint_path,
+        "result_path": result_path,
+        "num_epochs": num_epochs,
+        "lr": lr,
+        "batch_size": batch_size,
+        "threads_per_rank": threads_per_rank,
+        "balanced": balanced,
+        "weighted_loss": weighted_loss
+    }
+
+    ctx = mp.get_context("spawn")
+    events = ctx.Queue()
+    context = mp.start_processes(
+        _rank_main,
+        args=(world_size, _free_port(), config, events),
+        nprocs=world_size,
+        join=False,
+        start_method="spawn"
+    )
+
+    result = None
+    try:
+        # join() raises if any rank fails and terminates the others
+        while not context.join(timeout=0.2):
+            result = _drain(events, result)
+            cancellation.check(run_id)
+        result = _drain(events, result)
+    finally:
+        for process in context.processes:
+            if process.is_alive():
+                process.terminate()
+
+    if result is None:
+        raise RuntimeError("Distributed training finished without a result from rank 0")
+
+    return result
+
+
+def _drain(events, result):
+    """Forward queued rank-0 logs and metrics to this process; capture the result."""
+    while True:
+        try:
+            kind, payload = events.get_nowait()
+        except queue.Empty:
+            return result
+
+        if kind == "log":
+            logger.dispatch(payload)
+        else:
+            result = payload
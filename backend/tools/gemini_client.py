@@ -0,0 +1,34 @@
+"""
+Lazily configured Gemini client shared by the planner agents.
+
+Nothing is imported or configured until the first call, so importing the
+pipeline stays fast and works offline.
+"""
+import os
+import threading
+
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("AUTOMED_GEMINI_TIMEOUT", "20"))
+
+_models = {}
+_lock = threading.Lock()
+
+
+def get_model(model_name):
+    """Return a GenerativeModel, configuring genai on first use."""
+    with _lock:
+        if model_name not in _models:
+            import google.generativeai as genai
+            from dotenv import load_dotenv, find_dotenv
+
+            load_dotenv(find_dotenv(), override=False)
+            # IMPORTANT: Set GEMINI_API_KEY (environment or .env) before running
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY", "your-api-key"))
+            _models[model_name] = genai.GenerativeModel(model_name)
+
+        return _models[model_name]
+
+
+def generate_text(model_name, prompt, timeout=GEMINI_TIMEOUT_SECONDS):
+    """Run a prompt and return the stripped response text; raises on timeout."""
+    response = get_model(model_name).generate_content(prompt, request_options={"timeout": timeout})
+    return response.text.strip()
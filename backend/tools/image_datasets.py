@@ -0,0 +1,210 @@
+"""
+Train/test split datasets for any dataset source: an extracted folder
+(torchvision ImageFolder), zip / uncompressed tar archives (random
+access) or compressed tar archives (streamed), either as one archive or
+as a shard directory. See archive_source for the archive layout.
+
+Archive datasets expose the same classes / class_to_idx / samples /
+targets attributes as ImageFolder, with samples in the same order, so
+incremental splits, class counts and samplers work on any source.
+"""
+import io
+import itertools
+import os
+import random
+from collections import Counter
+
+from PIL import Image
+from torch.utils.data import Dataset, IterableDataset, get_worker_info
+from torchvision.datasets import ImageFolder
+
+from backend.tools.archive_source import (
+    MTIME,
+    REL,
+    SIZE,
+    ArchiveReader,
+    dataset_archives,
+    index_archive,
+    iter_archive_images,
+)
+
+# Decoded samples held back to shuffle a sequential tar stream
+SHUFFLE_BUFFER = int(os.getenv("AUTOMED_STREAM_SHUFFLE_BUFFER", "256"))
+
+RANDOM_ACCESS_KINDS = ("zip", "tar")
+
+
+class _ArchiveSplit:
+    """Members, classes and ImageFolder-style samples of one split of an archive dataset."""
+
+    def _load_split(self, dataset_path, split, transform):
+        self.dataset_path = dataset_path
+        self.split = split
+        self.transform = transform
+
+        # One entry per archive: a single archive, or every shard of a shard directory
+        self.archives = [archive for archive, _ in dataset_archives(dataset_path)]
+        self.kinds = []
+        entries = []
+        for shard, archive in enumerate(self.archives):
+            index = index_archive(archive)
+            self.kinds.append(index["kind"])
+            entries.extend(
+                (shard, position, m) for position, m in enumerate(index["members"]) if m[REL].startswith(f"{split}/")
+            )
+
+        # Sorted by relative path: the order ImageFolder would list the extracted files in
+        entries.sort(key=lambda e: (e[2][REL], e[0]))
+        self.members = [m for _, _, m in entries]
+        self.archive_positions = [(shard, position) for shard, position, _ in entries]
+
+        self.classes = sorted({m[REL].split("/")[1] for m in self.members})
+        self.class_to_idx = {cls: i for i, cls in enumerate(self.classes)}
+        self.samples = [
+            (os.path.join(self.archives[shard], m[REL]), self.class_to_idx[m[REL].split("/")[1]])
+            for (shard, _), m in zip(self.archive_positions, self.members)
+        ]
+        self.targets = [target for _, target in self.samples]
+        self.sample_signatures = [(m[SIZE], m[MTIME]) for m in self.members]
+
+    def _decode(self, data, target):
+        image = Image.open(io.BytesIO(data)).convert("RGB")
+        if self.transform is not None:
+            image = self.transform(image)
+        return image, target
+
+
+class ArchiveImageFolder(_ArchiveSplit, Dataset):
+    """ImageFolder over one split of zip / uncompressed tar archives, read with random access."""
+
+    def __init__(self, dataset_path, split, transform=None):
+        self._load_split(dataset_path, split, transform)
+        self.readers = [ArchiveReader(archive, kind) for archive, kind in zip(self.archives, self.kinds)]
+
+    def __len__(self):
+        return len(self.samples)
+
+    def __getitem__(self, i):
+        shard, _ = self.archive_positions[i]
+        return self._decode(self.readers[shard].read(self.members[i]), self.targets[i])
+
+
+class TarStreamDataset(_ArchiveSplit, IterableDataset):
+    """
+    One split of compressed tar archives, streamed WebDataset-style. The
+    consumers (DDP ranks x DataLoader workers) split the work so each
+    decodes only its share, and a shuffle buffer randomises the order:
+
+    - shard directory with at least one shard per consumer: the shards
+      are shuffled every epoch and dealt to the least-loaded consumer,
+      so each one reads only its own shards
+    - otherwise (e.g. a single .tar.gz): every consumer reads the whole
+      archive and keeps the samples dealt to it round-robin
+
+    Every consumer yields the same number of samples, so DDP ranks run
+    the same number of batches: like DistributedSampler, short consumers
+    wrap around to repeat some of their samples instead of dropping data.
+    len() is exact when the DataLoader has no workers.
+    """
+
+    def __init__(self, dataset_path, split, transform=None, indices=None, rank=0, world_size=1, seed=0):
+        self._load_split(dataset_path, split, transform)
+        self.indices = list(range(len(self.samples))) if indices is None else list(indices)
+        self.rank = rank
+        self.world_size = world_size
+        self.seed = seed
+        self.epoch = 0
+
+    def subset(self, indices=None, rank=0, world_size=1):
+        """Stream of the samples at `indices` (None = all) for one DDP rank."""
+        return TarStreamDataset(self.dataset_path, self.split, self.transform, indices, rank, world_size, self.seed)
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def __len__(self):
+        return len(self._consumer_samples(self.world_size, self.rank))
+
+    def _consumer_samples(self, consumers, consumer):
+        """This consumer's sample indices (repeats included), in the order its archives are read."""
+        selected = sorted(self.indices, key=lambda i: self.archive_positions[i])
+
+        if len(self.archives) < consumers:
+            # Deal in archive order, wrapping around so every consumer gets the same count
+            total = -(-len(selected) // consumers) * consumers
+            padded = list(itertools.islice(itertools.cycle(selected), total))
+            return sorted(padded[consumer::consumers], key=lambda i: self.archive_positions[i])
+
+        # Same shard shuffle on every consumer (seeded by the epoch); each shard then
+        # goes to the consumer with the fewest samples so far
+        shards = list(range(len(self.archives)))
+        random.Random(self.seed * 1000 + self.epoch).shuffle(shards)
+        counts = Counter(self.archive_positions[i][0] for i in selected)
+        assigned = [[] for _ in range(consumers)]
+        loads = [0] * consumers
+        for shard in shards:
+            least = min(range(consumers), key=loads.__getitem__)
+            assigned[least].append(shard)
+            loads[least] += counts[shard]
+        target = max(loads)
+
+        order = {shard: k for k, shard in enumerate(assigned[consumer])}
+        own = [i for i in selected if self.archive_positions[i][0] in order]
+        if len(own) < target:
+            # Repeat this consumer's own samples (read alongside the originals); a
+            # consumer whose shards are all empty borrows from the whole selection
+            extra = list(itertools.islice(itertools.cycle(own or selected), target - len(own)))
+            for i in extra:
+                order.setdefault(self.archive_positions[i][0], len(order))
+            own += extra
+        own.sort(key=lambda i: (order[self.archive_positions[i][0]], self.archive_positions[i][1]))
+        return own
+
+    def __iter__(self):
+        worker = get_worker_info()
+        num_workers = worker.num_workers if worker else 1
+        consumers = self.world_size * num_workers
+        consumer = self.rank * num_workers + (worker.id if worker else 0)
+
+        rng = random.Random(self.seed * 1000 + self.epoch * consumers + consumer)
+        buffer = []
+        for shard, group in itertools.groupby(
+            self._consumer_samples(consumers, consumer), key=lambda i: self.archive_positions[i][0]
+        ):
+            group = list(group)
+            wanted = {self.members[i][REL]: self.targets[i] for i in group}
+            # Repeated samples (padding) are read once and decoded once per copy
+            copies = Counter(self.members[i][REL] for i in group)
+            for rel, data in iter_archive_images(self.archives[shard], wanted):
+                for _ in range(copies[rel]):
+                    buffer.append(self._decode(data, wanted[rel]))
+                    if len(buffer) >= SHUFFLE_BUFFER:
+                        yield buffer.pop(rng.randrange(len(buffer)))
+
+        rng.shuffle(buffer)
+        yield from buffer
+
+
+def has_split(dataset_path, split):
+    """True if the dataset (folder, archive or shard directory) has a non-empty `split`."""
+    archives = dataset_archives(dataset_path)
+    if archives:
+        return any(
+            m[REL].startswith(f"{split}/") for archive, _ in archives for m in index_archive(archive)["members"]
+        )
+    return os.path.isdir(os.path.join(dataset_path, split))
+
+
+def open_split(dataset_path, split, transform=None):
+    """ImageFolder-like dataset for one split of a folder, archive or shard directory."""
+    archives = dataset_archives(dataset_path)
+    if not archives:
+        return ImageFolder(os.path.join(dataset_path, split), transform)
+    if all(index_archive(archive)["kind"] in RANDOM_ACCESS_KINDS for archive, _ in archives):
+        return ArchiveImageFolder(dataset_path, split, transform)
+    return TarStreamDataset(dataset_path, split, transform)
+
+
+def is_streaming(dataset):
+    """Streamed datasets have no random access (no samplers or Subset)."""
+    return isinstance(dataset, IterableDataset)
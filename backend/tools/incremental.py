@@ -0,0 +1,79 @@
+"""
+Helpers for incremental training: fine-tune the previously trained model
+on images added since its last run, mixed with a replay sample of the
+images it has already seen.
+"""
+import json
+import os
+import random
+
+import torch
+
+from backend.services.model_store import get_model_store
+
+# Old images replayed per new image (guards against catastrophic forgetting)
+REPLAY_RATIO = float(os.getenv("AUTOMED_REPLAY_RATIO", "1.0"))
+
+
+def load_previous_model(selected, classes):
+    """
+    Return {"state_dict", "files", "results", "path", "version"} for the latest
+    stored version of the model, or None if there is none or its classes
+    are not compatible.
+    """
+    record = get_model_store().get(selected)
+    # The classifier head maps indices to these names, so they must match exactly
+    if record is None or record["classes"] != classes:
+        return None
+
+    files = {}
+    if os.path.exists(record["files_path"]):
+        with open(record["files_path"], "r") as f:
+            files = json.load(f)
+
+    return {
+        "state_dict": torch.load(record["path"], map_location="cpu"),
+        "files": files,
+        "results": record["metrics"],
+        "path": record["path"],
+        "version": record["version"]
+    }
+
+
+def sample_file_index(samples, dataset_path, file_index):
+    """
+    file_index plus a [size, mtime_ns] signature for every sample it is
+    missing. The data inspector only indexes the files it scans, while
+    ImageFolder also loads other extensions and nested folders; without
+    a signature those samples would count as new on every run.
+    """
+    index = dict(file_index)
+    for path, _ in samples:
+        rel_path = os.path.relpath(path, dataset_path).replace(os.sep, "/")
+        if rel_path not in index and os.path.isfile(path):
+            st = os.stat(path)
+            index[rel_path] = [st.st_size, st.st_mtime_ns]
+    return index
+
+
+def split_new_samples(samples, dataset_path, file_index, previous_files):
+    """
+    Split ImageFolder samples into (new_indices, seen_indices). A sample
+    is new if it was not in the previous index or its size/mtime changed.
+    """
+    new_indices, seen_indices = [], []
+    for i, (path, _) in enumerate(samples):
+        rel_path = os.path.relpath(path, dataset_path).replace(os.sep, "/")
+        signature = file_index.get(rel_path)
+        if signature is not None and previous_files.get(rel_path) == signature:
+            seen_indices.append(i)
+        else:
+            new_indices.append(i)
+
+    return new_indices, seen_indices
+
+
+def replay_sample(seen_indices, num_new, ratio=REPLAY_RATIO, seed=0):
+    """Random sample of previously seen indices to mix into the update."""
+    k = min(len(seen_indices), int(round(num_new * ratio)))
+    return random.Random(seed).sample(seen_indices, k)
@@ -0,0 +1,75 @@
+"""
+On-disk response cache for the Gemini planner agents.
+
+Entries are keyed on (prompt template version, model name, canonicalized
+dataset stats), so identical datasets skip the network round-trip.
+"""
+import hashlib
+import json
+import os
+import time
+import uuid
+
+CACHE_DIR = os.getenv("AUTOMED_LLM_CACHE_DIR", os.path.join(".cache", "llm"))
+CACHE_TTL_SECONDS = int(os.getenv("AUTOMED_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Set AUTOMED_LLM_CACHE_BYPASS=1 to always call the LLM (results are still stored)
+CACHE_BYPASS = os.getenv("AUTOMED_LLM_CACHE_BYPASS", "0") == "1"
+
+# Float precision used when canonicalizing stats
+FLOAT_DIGITS = 4
+
+
+def canonicalize(value):
+    """Round floats and sort keys so equivalent stats hash identically."""
+    if isinstance(value, float):
+        return round(value, FLOAT_DIGITS)
+    if isinstance(value, dict):
+        return {str(k): canonicalize(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(v) for v in value]
+    return value
+
+
+def cache_key(prompt_version, model_name, stats):
+    payload = json.dumps(
+        {"prompt_version": prompt_version, "model": model_name, "stats": canonicalize(stats)},
+        sort_keys=True,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached(key, ttl=CACHE_TTL_SECONDS):
+    """Return the cached response for key, or None if missing or expired."""
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, "r") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if time.time() - entry.get("created_at", 0) > ttl:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+    return entry.get("response")
+
+
+def put_cached(key, response, prompt_version=None, model_name=None):
+    """Store a response atomically (readers never see a partial file)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"  # unique per writer, including threads
+
+    with open(tmp_path, "w") as f:
+        json.dump({
+            "created_at": time.time(),
+            "prompt_version": prompt_version,
+            "model": model_name,
+            "response": response
+        }, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,52 @@
+"""
+Local rule engine for the planner agents.
+
+Implements the same rules the Gemini prompts in augmentation_agent and
+model_selection_agent state, so a plan can be produced offline and
+without LLM latency.
+"""
+import os
+
+# "gemini": ask the LLM (cache first); "rules": always use this module
+PLANNER_BACKEND = os.getenv("AUTOMED_PLANNER_BACKEND", "gemini")
+
+
+def plan_augmentation(stats):
+    """Augmentation plan following the augmentation prompt's RULES."""
+    plan = {
+        "rotation": 10,
+        "flip": False,
+        "color_jitter": "medium"
+    }
+
+    if stats.get("size", 0) < 100:
+        plan["rotation"] = 15
+
+    if stats.get("imbalance_ratio", 1) > 3:
+        plan["flip"] = True
+
+    if stats.get("avg_blur", 0.0) > 10:
+        plan["rotation"] = min(plan["rotation"], 10)
+        plan["color_jitter"] = "low"
+
+    if stats.get("avg_noise", 0.0) > 0.15:
+        plan["color_jitter"] = "none"
+
+    return plan
+
+
+def select_model(stats):
+    """Model selection following the selection prompt's rules (first match wins)."""
+    if stats.get("size", 0) < 150:
+        return {"selected_model": "resnet", "reason": "Small dataset (< 150 images): ResNet18 trains quickly and reliably."}
+
+    if stats.get("imbalance_ratio", 1) > 3:
+        return {"selected_model": "efficientnet", "reason": "Imbalance ratio above 3: EfficientNet-B0 is the most stable on imbalanced data."}
+
+    if stats.get("avg_noise", 0.0) > 0.20:
+        return {"selected_model": "mobilenet", "reason": "High noise level: MobileNetV2 is robust to low-quality images."}
+
+    if stats.get("avg_blur", 0.0) > 12:
+        return {"selected_model": "efficientnet", "reason": "High blur score: EfficientNet-B0 generalizes best on degraded images."}
+
+    return {"selected_model": "efficientnet", "reason": "No special conditions: EfficientNet-B0 offers the best generalization."}
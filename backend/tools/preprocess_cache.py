@@ -0,0 +1,95 @@
+"""
+Decoded, resized image tensors cached on disk.
+
+Decoding and resizing JPEG/PNG files dominates the cost of short
+training runs. The sweep trains many candidates on the same data, so a
+split is decoded once into a uint8 N x 3 x 224 x 224 array and reused.
+Cache entries are keyed on a fingerprint of the split's files.
+
+Each entry is a directory of .npy files. The image array is written
+through a memory map as the split is decoded, so neither building nor
+reading an entry holds the whole split in RAM.
+"""
+import hashlib
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import torch
+import torchvision.transforms as T
+
+from backend import metrics
+from backend.tools.image_datasets import is_streaming, open_split
+
+CACHE_DIR = os.getenv("AUTOMED_PREPROCESS_CACHE_DIR", os.path.join(".cache", "preprocessed"))
+IMAGE_SIZE = 224
+
+
+def split_fingerprint(dataset, image_size=IMAGE_SIZE):
+    """Hash of every file's path, size and mtime (plus the target size)."""
+    digest = hashlib.sha256(str(image_size).encode())
+    # Archive samples are not files: their size and mtime come from the archive index
+    signatures = getattr(dataset, "sample_signatures", None)
+    for i, (path, target) in enumerate(dataset.samples):
+        if signatures is not None:
+            size, mtime = signatures[i]
+        else:
+            st = os.stat(path)
+            size, mtime = st.st_size, st.st_mtime_ns
+        digest.update(f"{path}|{target}|{size}|{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def load_preprocessed(dataset_path, split, image_size=IMAGE_SIZE):
+    """
+    Return (path, classes) of the cached arrays for a split, building
+    them if needed. The directory holds images.npy (uint8 N x 3 x H x W)
+    and targets.npy (int64 N).
+    """
+    transform = T.Compose([T.Resize((image_size, image_size)), T.PILToTensor()])
+    dataset = open_split(dataset_path, split, transform)
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = os.path.join(CACHE_DIR, split_fingerprint(dataset, image_size))
+    if os.path.exists(path):
+        return path, dataset.classes
+
+    # Built in a private directory and renamed into place once complete
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    os.makedirs(tmp_path)
+    try:
+        start = time.perf_counter()
+        images = np.lib.format.open_memmap(
+            os.path.join(tmp_path, "images.npy"), mode="w+", dtype=np.uint8,
+            shape=(len(dataset), 3, image_size, image_size)
+        )
+        targets = np.empty(len(dataset), dtype=np.int64)
+        # Streamed archives decode in one sequential pass (in their own order)
+        samples = iter(dataset) if is_streaming(dataset) else (dataset[i] for i in range(len(dataset)))
+        for i, (image, target) in enumerate(samples):
+            images[i], targets[i] = image.numpy(), target
+        images.flush()
+        del images
+        np.save(os.path.join(tmp_path, "targets.npy"), targets)
+        metrics.inc("automed_images_decoded_total", len(dataset), stage="preprocess")
+        metrics.inc("automed_decode_seconds_total", time.perf_counter() - start, stage="preprocess")
+
+        os.replace(tmp_path, path)
+    except OSError:
+        # Another run published the same entry first
+        if not os.path.exists(path):
+            raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return path, dataset.classes
+
+
+def read_preprocessed(path):
+    """Cached (images, targets) tensors; the images are memory-mapped, not loaded."""
+    # Copy-on-write: pages are shared with the file (and other readers) until written
+    images = np.load(os.path.join(path, "images.npy"), mmap_mode="c")
+    targets = np.load(os.path.join(path, "targets.npy"))
+    return torch.from_numpy(images), torch.from_numpy(targets)
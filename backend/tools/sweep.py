@@ -0,0 +1,236 @@
+"""
+Hyperparameter / architecture sweep with successive halving.
+
+Every (architecture x learning rate x batch size) candidate trains for a
+small epoch budget on the cached, preprocessed data; only the best 1/ETA
+of them continue to the next rung with ETA times the budget. Candidates
+of a rung train in parallel worker processes within a CPU budget, with
+the run's augmentation plan, and are ranked on a fixed hold-out of the
+training split. The winner then continues for FINISH_EPOCHS on the whole
+training split (hold-out included) before it is published.
+"""
+import math
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+import multiprocessing as mp
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+import torchvision.transforms as T
+
+from backend import cancellation
+from backend.logger import send_log
+from backend.tools.balanced_sampling import BalancedEpochSampler, class_weights
+from backend.tools.preprocess_cache import load_preprocessed, read_preprocessed
+from backend.tools.training import build_augmentations, build_model, cpu_budget
+
+SWEEP_ARCHITECTURES = ("resnet", "efficientnet", "mobilenet")
+SWEEP_LEARNING_RATES = (1e-3, 3e-4, 1e-4)
+SWEEP_BATCH_SIZES = (16, 32)
+
+# Successive halving: keep the top 1/ETA per rung, multiply the epoch budget by ETA
+ETA = 3
+MIN_EPOCHS = 1
+MAX_EPOCHS = int(os.getenv("AUTOMED_SWEEP_MAX_EPOCHS", "6"))
+
+# CPU budget for the whole sweep, and intra-op threads per candidate
+SWEEP_CPUS = int(os.getenv("AUTOMED_SWEEP_CPUS", "0"))  # 0 = the training CPU budget
+THREADS_PER_CANDIDATE = int(os.getenv("AUTOMED_SWEEP_THREADS", "2"))
+
+# Fraction of train held out for ranking candidates (the test split is
+# kept for reporting and calibration, so it never picks the winner)
+VALIDATION_FRACTION = 0.2
+
+# Epochs the winner continues for on the full training split
+FINISH_EPOCHS = int(os.getenv("AUTOMED_SWEEP_FINISH_EPOCHS", "1"))
+
+
+def sweep_candidates():
+    return [
+        {"id": f"{arch}-lr{lr:g}-bs{bs}", "arch": arch, "lr": lr, "batch_size": bs, "seed": i}
+        for i, (arch, lr, bs) in enumerate(product(SWEEP_ARCHITECTURES, SWEEP_LEARNING_RATES, SWEEP_BATCH_SIZES))
+    ]
+
+
+def _init_worker(threads):
+    torch.set_num_threads(threads)
+
+
+def _train_candidate(task):
+    """
+    Train one candidate up to task["target_epochs"] (continuing from its
+    saved state) and score it on the validation data, if any. Runs in a worker.
+    """
+    candidate = task["candidate"]
+    # Memory-mapped: batches are gathered by index so workers never copy the whole cache
+    images, all_targets = read_preprocessed(task["cache"])
+    train_idx = torch.tensor(task["train_indices"], dtype=torch.long)
+    val_idx = torch.tensor(task["val_indices"], dtype=torch.long)
+    targets, val_targets = all_targets[train_idx], all_targets[val_idx]
+    # Same augmentation plan as the normal training path
+    augment = T.Compose(build_augmentations(task["aug"]))
+
+    model = build_model(candidate["arch"], task["num_classes"], pretrained=not os.path.exists(task["state_path"]))
+    optimizer = optim.Adam(model.parameters(), lr=candidate["lr"])
+    done_epochs = 0
+    if os.path.exists(task["state_path"]):
+        saved = torch.load(task["state_path"], map_location="cpu")
+        model.load_state_dict(saved["model"])
+        optimizer.load_state_dict(saved["optimizer"])
+        done_epochs = saved["epochs"]
+
+    weight = class_weights(targets.tolist(), task["num_classes"]) if task["weighted_loss"] else None
+    criterion = nn.CrossEntropyLoss(weight=weight)
+    seed = candidate["seed"]
+    sampler = BalancedEpochSampler(targets.tolist(), task["num_classes"], seed=seed) if task["balanced"] else None
+    # Reseeded per rung so a continued candidate does not replay earlier epochs' order
+    generator = torch.Generator().manual_seed(seed * 1000 + done_epochs)
+    torch.manual_seed(seed * 1000 + done_epochs)  # augmentation randomness
+
+    model.train()
+    for epoch in range(done_epochs, task["target_epochs"]):
+        if sampler is not None:
+            sampler.set_epoch(epoch)
+            order = torch.tensor(list(iter(sampler)), dtype=torch.long)
+        else:
+            order = torch.randperm(len(targets), generator=generator)
+
+        for start in range(0, len(order), candidate["batch_size"]):
+            batch = order[start:start + candidate["batch_size"]]
+            imgs = images[train_idx[batch]].float().div_(255)
+            imgs = torch.stack([augment(img) for img in imgs])
+
+            optimizer.zero_grad()
+            loss = criterion(model(imgs), targets[batch])
+            loss.backward()
+            optimizer.step()
+
+    tmp_path = f"{task['state_path']}.tmp"
+    torch.save({"model": model.state_dict(), "optimizer": optimizer.state_dict(), "epochs": task["target_epochs"]}, tmp_path)
+    os.replace(tmp_path, task["state_path"])
+    if not task["val_indices"]:
+        return {"id": candidate["id"], "val_accuracy": None, "val_preds": [], "val_labels": []}
+
+    # Validation
+    model.eval()
+    preds = []
+    with torch.no_grad():
+        for start in range(0, len(val_idx), 64):
+            imgs = images[val_idx[start:start + 64]].float().div_(255)
+            preds.extend(model(imgs).argmax(dim=1).tolist())
+
+    labels = val_targets.tolist()
+    accuracy = sum(int(p == l) for p, l in zip(preds, labels)) / max(len(labels), 1)
+
+    return {"id": candidate["id"], "val_accuracy": accuracy, "val_preds": preds, "val_labels": labels}
+
+
+def run_sweep(dataset_path, aug, num_classes, balanced=False, weighted_loss=False, cpus=SWEEP_CPUS, run_id=None):
+    """
+    Run the successive-halving sweep. Returns {"winner", "state_dict",
+    "val_preds", "val_labels", "leaderboard"}; val_preds / val_labels are
+    the winner's hold-out predictions from its final rung, and the weights
+    are those after finishing it on the full training split.
+    """
+    cache, classes = load_preprocessed(dataset_path, "train")
+
+    # Deterministic hold-out from the training split
+    _, targets = read_preprocessed(cache)
+    order = torch.randperm(len(targets), generator=torch.Generator().manual_seed(0)).tolist()
+    num_val = max(1, int(len(order) * VALIDATION_FRACTION))
+    val_indices, train_indices = order[:num_val], order[num_val:]
+
+    # Never more than the pipeline worker's thread budget
+    cpus = min(cpus, cpu_budget()) if cpus else cpu_budget()
+    threads = max(1, min(THREADS_PER_CANDIDATE, cpus))
+    workers = max(1, cpus // threads)
+
+    candidates = sweep_candidates()
+
+    # Download the ImageNet weights once so workers do not race for the hub cache
+    for arch in SWEEP_ARCHITECTURES:
+        build_model(arch, num_classes, pretrained=True)
+
+    leaderboard = {c["id"]: {**c, "epochs": 0, "val_accuracy": None} for c in candidates}
+    send_log("trainer", f"Sweep: {len(candidates)} candidates, {workers} parallel workers x {threads} threads")
+
+    with tempfile.TemporaryDirectory(prefix="automed_sweep_") as state_dir:
+        survivors = candidates
+        rung_epochs = MIN_EPOCHS
+        results = {}
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(threads,)
+        ) as pool:
+            while True:
+                tasks = [{
+                    "candidate": c,
+                    "num_classes": num_classes,
+                    "cache": cache,
+                    "train_indices": train_indices,
+                    "val_indices": val_indices,
+                    "state_path": os.path.join(state_dir, f"{c['id']}.pt"),
+                    "target_epochs": rung_epochs,
+                    "aug": aug,
+                    "balanced": balanced,
+                    "weighted_loss": weighted_loss
+                } for c in survivors]
+
+                for result in pool.map(_train_candidate, tasks):
+                    results[result["id"]] = result
+                    leaderboard[result["id"]].update(epochs=rung_epochs, val_accuracy=result["val_accuracy"])
+
+                survivors = sorted(survivors, key=lambda c: results[c["id"]]["val_accuracy"], reverse=True)
+                best = survivors[0]
+                send_log(
+                    "trainer",
+                    f"Sweep rung ({rung_epochs} epochs, {len(survivors)} candidates): "
+                    f"best {best['id']} val_acc={results[best['id']]['val_accuracy']:.3f}"
+                )
+
+                if len(survivors) == 1 or rung_epochs >= MAX_EPOCHS:
+                    break
+
+                cancellation.check(run_id)
+                survivors = survivors[:math.ceil(len(survivors) / ETA)]
+                rung_epochs = min(rung_epochs * ETA, MAX_EPOCHS)
+
+            winner = survivors[0]
+            if FINISH_EPOCHS > 0:
+                cancellation.check(run_id)
+                send_log("trainer", f"Sweep: finishing {winner['id']} on the full training split ({FINISH_EPOCHS} epochs)")
+                pool.submit(_train_candidate, {
+                    "candidate": winner,
+                    "num_classes": num_classes,
+                    "cache": cache,
+                    "train_indices": order,
+                    "val_indices": [],
+                    "state_path": os.path.join(state_dir, f"{winner['id']}.pt"),
+                    "target_epochs": rung_epochs + FINISH_EPOCHS,
+                    "aug": aug,
+                    "balanced": balanced,
+                    "weighted_loss": weighted_loss
+                }).result()
+
+        state_dict = torch.load(os.path.join(state_dir, f"{winner['id']}.pt"), map_location="cpu")["model"]
+
+    ranked = sorted(
+        leaderboard.values(),
+        key=lambda row: (row["epochs"], row["val_accuracy"] or 0.0),
+        reverse=True
+    )
+
+    return {
+        "winner": winner,
+        "classes": classes,
+        "state_dict": state_dict,
+        "val_preds": results[winner["id"]]["val_preds"],
+        "val_labels": results[winner["id"]]["val_labels"],
+        "leaderboard": ranked
+    }
@@ -0,0 +1,139 @@
+"""
+Shared training building blocks used by the trainer agent and the
+multi-process (DDP) trainer: model/transform construction, the epoch
+loop and atomic epoch checkpoints.
+"""
+import os
+import time
+
+import torch
+import torch.nn as nn
+import torchvision.transforms as T
+from torchvision import models
+
+from backend import metrics
+
+NUM_EPOCHS = 2
+LEARNING_RATE = 1e-4
+BATCH_SIZE = 16
+
+# Per-run epoch checkpoints: checkpoints/{run_id}/trainer.pt
+CHECKPOINT_DIR = "checkpoints"
+
+
+def cpu_budget():
+    """
+    Cores training may use: the pipeline worker's thread budget
+    (AUTOMED_WORKER_THREADS, exported to its children) or every core.
+    """
+    return int(os.getenv("AUTOMED_WORKER_THREADS", "0")) or os.cpu_count() or 1
+
+
+def build_model(selected_model, num_classes, pretrained=True):
+    if selected_model == "resnet":
+        model = models.resnet18(pretrained=pretrained)
+        model.fc = nn.Linear(512, num_classes)
+
+    elif selected_model == "efficientnet":
+        model = models.efficientnet_b0(pretrained=pretrained)
+        model.classifier[1] = nn.Linear(model.classifier[1].in_features, num_classes)
+
+    elif selected_model == "mobilenet":
+        model = models.mobilenet_v2(pretrained=pretrained)
+        model.classifier[1] = nn.Linear(model.classifier[1].in_features, num_classes)
+
+    else:
+        raise ValueError("Invalid model selected")
+
+    return model
+
+
+def build_augmentations(aug):
+    """Random augmentations of a plan; they apply to PIL images and float CHW tensors alike."""
+    transforms = [T.RandomRotation(aug["rotation"])]
+
+    if aug["flip"]:
+        transforms.append(T.RandomHorizontalFlip())
+
+    if aug["color_jitter"] == "low":
+        transforms.append(T.ColorJitter(brightness=0.1, contrast=0.1))
+    elif aug["color_jitter"] == "medium":
+        transforms.append(T.ColorJitter(brightness=0.2, contrast=0.2))
+
+    return transforms
+
+
+def build_transform(aug):
+    """Training transform for an augmentation plan (picklable, for worker processes)."""
+    return T.Compose([T.Resize((224, 224)), *build_augmentations(aug), T.ToTensor()])
+
+
+def train_one_epoch(model, loader, criterion, optimizer, device):
+    """
+    Run one epoch; returns (predictions, labels) seen during training.
+    Records dataloader wait, batch step time and throughput metrics.
+    """
+    model.train()
+    all_preds, all_labels = [], []
+    num_images = 0
+    epoch_start = wait_start = time.perf_counter()
+
+    for imgs, labels in loader:
+        step_start = time.perf_counter()
+        # Batches are decoded and augmented by the loader while we wait
+        metrics.observe("automed_dataloader_wait_seconds", step_start - wait_start)
+        metrics.inc("automed_images_decoded_total", len(labels), stage="train")
+
+        imgs = imgs.to(device)
+        labels = labels.to(device)
+
+        optimizer.zero_grad()
+        outputs = model(imgs)
+        loss = criterion(outputs, labels)
+        loss.backward()
+        optimizer.step()
+
+        preds = torch.argmax(outputs, dim=1)
+        all_preds.extend(preds.cpu().tolist())
+        all_labels.extend(labels.cpu().tolist())
+
+        num_images += len(labels)
+        wait_start = time.perf_counter()
+        metrics.observe("automed_train_batch_seconds", wait_start - step_start)
+
+    elapsed = time.perf_counter() - epoch_start
+    if elapsed > 0:
+        metrics.set_gauge("automed_train_images_per_second", num_images / elapsed)
+
+    return all_preds, all_labels
+
+
+def trainer_checkpoint_path(run_id):
+    return os.path.join(CHECKPOINT_DIR, run_id, "trainer.pt")
+
+
+def save_trainer_checkpoint(path, checkpoint):
+    """Atomically write an epoch checkpoint (a crash never leaves a torn file)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    torch.save(checkpoint, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_trainer_checkpoint(path, selected, classes, mode):
+    """
+    Return the saved checkpoint if it matches this model, class set and
+    mode, else None. Raises nothing: an unusable checkpoint means a fresh start.
+    """
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        checkpoint = torch.load(path, map_location="cpu")
+    except Exception:
+        return None
+
+    if (checkpoint.get("selected"), checkpoint.get("classes"), checkpoint.get("mode")) != (selected, classes, mode):
+        return None
+
+    return checkpoint
@@ -1,150 +1,150 @@
-"use client";
-
-import { useState, useRef } from "react";
-
-interface ImageUploadProps {
-    onUpload: (file: File) => void;
-    isLoading: boolean;
-}
-
-export default function ImageUpload({ onUpload, isLoading }: ImageUploadProps) {
-    const [dragActive, setDragActive] = useState(false);
-    const [selectedFile, setSelectedFile] = useState<File | null>(null);
-    const [previewUrl, setPreviewUrl] = useState<string | null>(null);
-    const inputRef = useRef<HTMLInputElement>(null);
-
-    const handleDrag = (e: React.DragEvent) => {
-        e.preventDefault();
-        e.stopPropagation();
-        if (e.type === "dragenter" || e.type === "dragover") {
-            setDragActive(true);
-        } else if (e.type === "dragleave") {
-            setDragActive(false);
-        }
-    };
-
-    const handleDrop = (e: React.DragEvent) => {
-        e.preventDefault();
-        e.stopPropagation();
-        setDragActive(false);
-        if (e.dataTransfer.files && e.dataTransfer.files[0]) {
-            handleFile(e.dataTransfer.files[0]);
-        }
-    };
-
-    const handleChange = (e: React.ChangeEvent<HTMLInputElement>) => {
-        e.preventDefault();
-        if (e.target.files && e.target.files[0]) {
-            handleFile(e.target.files[0]);
-        }
-        e.target.value = '';
-    };
-
-    const handleFile = (file: File) => {
-        if (!file.type.startsWith("image/")) {
-            alert("Please upload an image file");
-            return;
-        }
-        setSelectedFile(file);
-        const url = URL.createObjectURL(file);
-        setPreviewUrl(url);
-    };
-
-    const handleSubmit = (e: React.FormEvent) => {
-        e.preventDefault();
-        if (selectedFile) {
-            onUpload(selectedFile);
-        }
-    };
-
-    const triggerInput = () => {
-        inputRef.current?.click();
-    };
-
-    return (
-        <div className="space-y-4">
-            <input
-                ref={inputRef}
-                type="file"
-                className="hidden"
-                accept="image/*"
-                onChange={handleChange}
-                disabled={isLoading}
-            />
-
-            {!selectedFile ? (
-                <div
-                    className={`upload-zone ${dragActive ? "border-primary bg-primary/10" : ""}`}
-                    onDragEnter={handleDrag}
-                    onDragLeave={handleDrag}
-                    onDragOver={handleDrag}
-                    onDrop={handleDrop}
-                    onClick={triggerInput}
-                >
-                    <div className="w-16 h-16 mb-4 rounded-full bg-primary/10 flex items-center justify-center text-primary">
-                        <svg className="w-8 h-8" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z" />
-                        </svg>
-                    </div>
-
-                    <p className="text-lg font-medium text-foreground mb-1">Upload Test Image</p>
-                    <p className="text-sm text-muted-foreground">Drag & drop or click to browse</p>
-                </div>
-            ) : (
-                <div className="relative rounded-lg overflow-hidden border border-border/30 bg-background/50 group">
-                    <img
-                        src={previewUrl!}
-                        alt="Preview"
-                        className="w-full h-64 object-contain"
-                    />
-
-                    <div
-                        className="absolute inset-0 bg-black/60 opacity-0 group-hover:opacity-100 transition-opacity flex items-center justify-center cursor-pointer"
-                        onClick={triggerInput}
-                    >
-                        <p className="text-white font-medium flex items-center gap-2">
-                            <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 16v1a3 3 0 003 3h10a3 3 0 003-3v-1m-4-8l-4-4m0 0L8 8m4-4v12" />
-                            </svg>
-                            <span>Change Image</span>
-                        </p>
-                    </div>
-
-                    <button
-                        onClick={(e) => {
-                            e.stopPropagation();
-                            setSelectedFile(null);
-                            setPreviewUrl(null);
-                        }}
-                        className="absolute top-2 right-2 p-2 rounded-full bg-black/60 text-white hover:bg-destructive/80 transition-colors z-10"
-                    >
-                        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M6 18L18 6M6 6l12 12" />
-                        </svg>
-                    </button>
-                </div>
-            )}
-
-            <button
-                onClick={handleSubmit}
-                disabled={isLoading || !selectedFile}
-                className="w-full btn-primary-ghost flex items-center justify-center gap-2"
-            >
-                {isLoading ? (
-                    <>
-                        <div className="animate-spin h-5 w-5 border-2 border-current border-t-transparent rounded-full" />
-                        <span>Running Analysis...</span>
-                    </>
-                ) : (
-                    <>
-                        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
-                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M14.752 11.168l-3.197-2.132A1 1 0 0010 9.87v4.263a1 1 0 001.555.832l3.197-2.132a1 1 0 000-1.664z" />
-                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M21 12a9 9 0 11-18 0 9 9 0 0118 0z" />
-                        </svg>
-                        <span>Run Model Test</span>
-                    </>
-                )}
-            </button>
-        </div>
-    );
-}
+"use client";
+
+import { useState, useRef } from "react";
+
+interface ImageUploadProps {
+    onUpload: (file: File) => void;
+    isLoading: boolean;
+}
+
+export default function ImageUpload({ onUpload, isLoading }: ImageUploadProps) {
+    const [dragActive, setDragActive] = useState(false);
+    const [selectedFile, setSelectedFile] = useState<File | null>(null);
+    const [previewUrl, setPreviewUrl] = useState<string | null>(null);
+    const inputRef = useRef<HTMLInputElement>(null);
+
+    const handleDrag = (e: React.DragEvent) => {
+        e.preventDefault();
+        e.stopPropagation();
+        if (e.type === "dragenter" || e.type === "dragover") {
+            setDragActive(true);
+        } else if (e.type === "dragleave") {
+            setDragActive(false);
+        }
+    };
+
+    const handleDrop = (e: React.DragEvent) => {
+        e.preventDefault();
+        e.stopPropagation();
+        setDragActive(false);
+        if (e.dataTransfer.files && e.dataTransfer.files[0]) {
+            handleFile(e.dataTransfer.files[0]);
+        }
+    };
+
+    const handleChange = (e: React.ChangeEvent<HTMLInputElement>) => {
+        e.preventDefault();
+        if (e.target.files && e.target.files[0]) {
+            handleFile(e.target.files[0]);
+        }
+        e.target.value = '';
+    };
+
+    const handleFile = (file: File) => {
+        if (!file.type.startsWith("image/")) {
+            alert("Please upload an image file");
+            return;
+        }
+        setSelectedFile(file);
+        const url = URL.createObjectURL(file);
+        setPreviewUrl(url);
+    };
+
+    const handleSubmit = (e: React.FormEvent) => {
+        e.preventDefault();
+        if (selectedFile) {
+            onUpload(selectedFile);
+        }
+    };
+
+    const triggerInput = () => {
+        inputRef.current?.click();
+    };
+
+    return (
+        <div className="space-y-4">
+            <input
+                ref={inputRef}
+                type="file"
+                className="hidden"
+                accept="image/*"
+                onChange={handleChange}
+                disabled={isLoading}
+            />
+
+            {!selectedFile ? (
+                <div
+                    className={`upload-zone ${dragActive ? "border-primary bg-primary/10" : ""}`}
+                    onDragEnter={handleDrag}
+                    onDragLeave={handleDrag}
+                    onDragOver={handleDrag}
+                    onDrop={handleDrop}
+                    onClick={triggerInput}
+                >
+                    <div className="w-16 h-16 mb-4 rounded-full bg-primary/10 flex items-center justify-center text-primary">
+                        <svg className="w-8 h-8" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z" />
+                        </svg>
+                    </div>
+
+                    <p className="text-lg font-medium text-foreground mb-1">Upload Test Image</p>
+                    <p className="text-sm text-muted-foreground">Drag & drop or click to browse</p>
+                </div>
+            ) : (
+                <div className="relative rounded-lg overflow-hidden border border-border/30 bg-background/50 group">
+                    <img
+                        src={previewUrl!}
+                        alt="Preview"
+                        className="w-full h-64 object-contain"
+                    />
+
+                    <div
+                        className="absolute inset-0 bg-black/60 opacity-0 group-hover:opacity-100 transition-opacity flex items-center justify-center cursor-pointer"
+                        onClick={triggerInput}
+                    >
+                        <p className="text-white font-medium flex items-center gap-2">
+                            <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                                <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M4 16v1a3 3 0 003 3h10a3 3 0 003-3v-1m-4-8l-4-4m0 0L8 8m4-4v12" />
+                            </svg>
+                            <span>Change Image</span>
+                        </p>
+                    </div>
+
+                    <button
+                        onClick={(e) => {
+                            e.stopPropagation();
+                            setSelectedFile(null);
+                            setPreviewUrl(null);
+                        }}
+                        className="absolute top-2 right-2 p-2 rounded-full bg-black/60 text-white hover:bg-destructive/80 transition-colors z-10"
+                    >
+                        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M6 18L18 6M6 6l12 12" />
+                        </svg>
+                    </button>
+                </div>
+            )}
+
+            <button
+                onClick={handleSubmit}
+                disabled={isLoading || !selectedFile}
+                className="w-full btn-primary-ghost flex items-center justify-center gap-2"
+            >
+                {isLoading ? (
+                    <>
+                        <div className="animate-spin h-5 w-5 border-2 border-current border-t-transparent rounded-full" />
+                        <span>Running Analysis...</span>
+                    </>
+                ) : (
+                    <>
+                        <svg className="w-5 h-5" fill="none" stroke="currentColor" viewBox="0 0 24 24">
+                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M14.752 11.168l-3.197-2.132A1 1 0 0010 9.87v4.263a1 1 0 001.555.832l3.197-2.132a1 1 0 000-1.664z" />
+                            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M21 12a9 9 0 11-18 0 9 9 0 0118 0z" />
+                        </svg>
+                        <span>Run Model Test</span>
+                    </>
+                )}
+            </button>
+        </div>
+    );
+}
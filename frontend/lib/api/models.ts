@@ -1,38 +1,55 @@
-import { apiClient, API_BASE_URL } from "./client";
-import { Model, TestResult } from "../types/model";
-
-export const modelsApi = {
-    async listModels(): Promise<{ models: Model[] }> {
-        return apiClient.get("/api/models");
-    },
-
-    getDownloadUrl(modelName: string): string {
-        return apiClient.getDownloadUrl(`/api/models/${modelName}/download`);
-    },
-
-    async testModel(modelName: string, imageFile: File): Promise<TestResult> {
-        const formData = new FormData();
-        formData.append("model_name", modelName);
-        formData.append("file", imageFile);
-
-        // We use fetch directly here because apiClient.post expects JSON by default
-        // and we need to let the browser set the Content-Type header for FormData
-        const response = await fetch(`${API_BASE_URL}/api/models/test`, {
-            method: "POST",
-            body: formData,
-        });
-
-        if (!response.ok) {
-            let errorMessage = response.statusText;
-            try {
-                const errorData = await response.json();
-                errorMessage = errorData.detail || errorData.message || JSON.stringify(errorData);
-            } catch (e) {
-                // Ignore JSON parse error
-            }
-            throw new Error(`API error: ${errorMessage}`);
-        }
-
-        return response.json();
-    },
-};
+import { apiClient, API_BASE_URL } from "./client";
+import { ArtifactFormat, Model, TestResult, XAIMethod } from "../types/model";
+
+export const modelsApi = {
+    async listModels(): Promise<{ models: Model[] }> {
+        return apiClient.get("/api/models");
+    },
+
+    async listVersions(modelName: string): Promise<{ models: Model[] }> {
+        return apiClient.get(`/api/models/${encodeURIComponent(modelName)}/versions`);
+    },
+
+    // Latest version unless one is given; format "pt" is the raw state_dict
+    getDownloadUrl(modelName: string, version?: number, format: ArtifactFormat = "pt"): string {
+        const params = new URLSearchParams();
+        if (version !== undefined) {
+            params.set("version", String(version));
+        }
+        if (format !== "pt") {
+            params.set("format", format);
+        }
+        const query = params.toString();
+        return apiClient.getDownloadUrl(
+            `/api/models/${encodeURIComponent(modelName)}/download${query ? `?${query}` : ""}`
+        );
+    },
+
+    async testModel(modelName: string, imageFile: File, method: XAIMethod = "gradcam", tta = false): Promise<TestResult> {
+        const formData = new FormData();
+        formData.append("model_name", modelName);
+        formData.append("file", imageFile);
+        formData.append("method", method);
+        formData.append("tta", String(tta));
+
+        // We use fetch directly here because apiClient.post expects JSON by default
+        // and we need to let the browser set the Content-Type header for FormData
+        const response = await fetch(`${API_BASE_URL}/api/models/test`, {
+            method: "POST",
+            body: formData,
+        });
+
+        if (!response.ok) {
+            let errorMessage = response.statusText;
+            try {
+                const errorData = await response.json();
+                errorMessage = errorData.detail || errorData.message || JSON.stringify(errorData);
+            } catch (e) {
+                // Ignore JSON parse error
+            }
+            throw new Error(`API error: ${errorMessage}`);
+        }
+
+        return response.json();
+    },
+};
@@ -1,6 +1,6 @@
-export interface AgentLog {
-    timestamp: string;
-    agent: string;
-    message: string;
-    level: "info" | "warning" | "error";
-}
+export interface AgentLog {
+    timestamp: string;
+    agent: string;
+    message: string;
+    level: "info" | "warning" | "error";
+}
@@ -1,12 +1,29 @@
-export interface Model {
-    name: string;
-    path: string;
-    size: string;
-}
-
-export interface TestResult {
-    predicted_class: number;
-    confidence: number;
-    heatmap_base64?: string;
-    explanation?: string;
-}
+// Download formats of /api/models/{name}/download
+export type ArtifactFormat = "pt" | "fp16" | "pt.gz" | "fp16.gz";
+
+export interface Model {
+    name: string;
+    path: string;
+    size: string;
+    version?: number;
+    run_id?: string | null;
+    created_at?: string;
+    sha256?: string;
+    classes?: string[] | null;
+    metrics?: Record<string, unknown>;
+}
+
+// Explanation methods of /api/models/test
+export type XAIMethod = "gradcam" | "gradcam++" | "scorecam" | "integrated_gradients";
+
+export interface TestResult {
+    predicted_class: number;
+    confidence: number;
+    heatmap_base64?: string;
+    explanation?: string;
+    method?: XAIMethod;
+    probabilities?: number[];
+    class_names?: string[] | null;
+    calibrated?: boolean;
+    tta?: boolean;
+}
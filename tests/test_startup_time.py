@@ -0,0 +1,33 @@
+"""
+Import-time budget of the API modules (see backend/benchmarks/startup_time.py).
+
+Each module is imported in a fresh interpreter; the test fails if the
+import loads a heavy ML dependency (torch, torchvision, cv2, ...)
+eagerly. Wall-clock timings depend on the machine, so the
+AUTOMED_STARTUP_BUDGET_MS check only runs with AUTOMED_STARTUP_TIMING=1.
+"""
+import os
+import re
+
+import pytest
+
+from backend.benchmarks.startup_time import DEFAULT_BUDGET_MS, STARTUP_MODULES, measure_import
+
+CHECK_TIMING = os.getenv("AUTOMED_STARTUP_TIMING") == "1"
+
+
+@pytest.mark.parametrize("module", STARTUP_MODULES)
+def test_startup_import(module):
+    try:
+        total_ms, imports, eager = measure_import(module)
+    except RuntimeError as e:
+        # A missing third-party package (e.g. fastapi in a minimal env) is not a startup regression
+        missing = re.search(r"No module named '([^']+)'", str(e))
+        if missing and not missing.group(1).startswith("backend"):
+            pytest.skip(f"{module} needs {missing.group(1)}")
+        raise
+
+    assert not eager, f"{module} eagerly imports {', '.join(eager)}"
+    if CHECK_TIMING:
+        slowest = ", ".join(f"{name} {ms:.0f} ms" for ms, name in imports[:5])
+        assert total_ms <= DEFAULT_BUDGET_MS, f"{module} took {total_ms:.0f} ms (> {DEFAULT_BUDGET_MS:.0f} ms): {slowest}"